@@ -0,0 +1,31 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: 188adc8b6f7a
+Revises: 630c72a94b6f
+Create Date: 2026-10-18 10:02:17.440913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '188adc8b6f7a'
+down_revision = '630c72a94b6f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Composite (sort key, id) indexes used by cursor pagination
+    op.create_index('ix_book_title_id', 'book', ['title', 'id'], unique=False)
+    op.create_index('ix_book_price_id', 'book', ['price', 'id'], unique=False)
+    op.create_index('ix_order_created_at_id', 'order', ['created_at', 'id'], unique=False)
+    op.create_index('ix_order_user_id_created_at_id', 'order', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_order_user_id_created_at_id', table_name='order')
+    op.drop_index('ix_order_created_at_id', table_name='order')
+    op.drop_index('ix_book_price_id', table_name='book')
+    op.drop_index('ix_book_title_id', table_name='book')
@@ -0,0 +1,56 @@
+"""add_book_search_vector
+
+Revision ID: 630c72a94b6f
+Revises: 3a78ef6d26f7
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '630c72a94b6f'
+down_revision = '3a78ef6d26f7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Weighted full-text document: title (A) > author (B) > description (C)
+    op.add_column('book', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION book_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(NEW.author, '')), 'B') ||
+                setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER book_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF title, author, description ON book
+            FOR EACH ROW EXECUTE FUNCTION book_search_vector_update();
+    """)
+
+    # Backfill existing rows
+    op.execute("""
+        UPDATE book SET search_vector =
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(author, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'C')
+    """)
+
+    op.create_index('ix_book_search_vector', 'book', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    op.drop_index('ix_book_search_vector', table_name='book')
+    op.execute("DROP TRIGGER IF EXISTS book_search_vector_trigger ON book")
+    op.execute("DROP FUNCTION IF EXISTS book_search_vector_update()")
+    op.drop_column('book', 'search_vector')
@@ -0,0 +1,44 @@
+"""add_import_job_table
+
+Revision ID: 9c4e2a7b1d35
+Revises: f81fff83f19c
+Create Date: 2026-10-18 14:02:17.418206
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c4e2a7b1d35'
+down_revision = 'f81fff83f19c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('import_job',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=True),
+        sa.Column('format', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('rows_read', sa.Integer(), nullable=False),
+        sa.Column('rows_inserted', sa.Integer(), nullable=False),
+        sa.Column('rows_updated', sa.Integer(), nullable=False),
+        sa.Column('rows_failed', sa.Integer(), nullable=False),
+        sa.Column('errors', sa.Text(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_import_job_id'), 'import_job', ['id'], unique=False)
+    op.create_index(op.f('ix_import_job_created_at'), 'import_job', ['created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_import_job_created_at'), table_name='import_job')
+    op.drop_index(op.f('ix_import_job_id'), table_name='import_job')
+    op.drop_table('import_job')
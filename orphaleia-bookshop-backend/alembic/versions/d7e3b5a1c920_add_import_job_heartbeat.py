@@ -0,0 +1,24 @@
+"""add_import_job_heartbeat
+
+Revision ID: d7e3b5a1c920
+Revises: 9c4e2a7b1d35
+Create Date: 2026-10-18 18:21:05.113942
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7e3b5a1c920'
+down_revision = '9c4e2a7b1d35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('import_job', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('import_job', 'heartbeat_at')
@@ -0,0 +1,40 @@
+"""add_idempotency_key_table
+
+Revision ID: f81fff83f19c
+Revises: 188adc8b6f7a
+Create Date: 2026-10-18 11:24:51.902335
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f81fff83f19c'
+down_revision = '188adc8b6f7a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('idempotency_key',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('request_hash', sa.String(), nullable=False),
+        sa.Column('order_id', sa.String(), nullable=True),
+        sa.Column('response_body', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['order_id'], ['order.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'key', name='uq_user_idempotency_key')
+    )
+    op.create_index(op.f('ix_idempotency_key_id'), 'idempotency_key', ['id'], unique=False)
+    op.create_index(op.f('ix_idempotency_key_created_at'), 'idempotency_key', ['created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_idempotency_key_created_at'), table_name='idempotency_key')
+    op.drop_index(op.f('ix_idempotency_key_id'), table_name='idempotency_key')
+    op.drop_table('idempotency_key')
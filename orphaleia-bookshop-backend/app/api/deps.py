@@ -1,24 +1,25 @@
-from typing import Generator
+from typing import AsyncGenerator, Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from app import models, schemas
-from app.core import security
+from app.core.cache import cache_key, principal_cache, replica_pins, user_tag
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal, get_async_db, get_db, replica_router  # noqa: F401
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> models.User:
+def decode_access_token(token: str) -> schemas.TokenPayload:
     """
-    Validate access token and return current user.
+    Validate access token and return its payload.
     """
     try:
         payload = jwt.decode(
@@ -30,7 +31,76 @@ def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = db.query(models.User).filter(models.User.id == token_data.sub).first()
+    return token_data
+
+
+def token_subject(authorization: Optional[str]) -> Optional[str]:
+    """
+    Return the user id of a bearer Authorization header, or None when the
+    header is missing or the token is invalid.
+    """
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+    except JWTError:
+        return None
+    return payload.get("sub")
+
+
+async def pin_to_primary(user_id: Optional[str] = None) -> None:
+    """
+    Send the user's reads to the primary for REPLICA_PIN_SECONDS, so they see
+    their own writes. Without a user id, pins every request (catalog writes).
+    """
+    if replica_router.engines:
+        await replica_pins.set(cache_key("pin", user=user_id or "*"), True)
+
+
+async def is_pinned_to_primary(user_id: Optional[str]) -> bool:
+    if await replica_pins.get(cache_key("pin", user="*")):
+        return True
+    return bool(user_id) and bool(await replica_pins.get(cache_key("pin", user=user_id)))
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function to get a DB session for read-only handlers: a healthy
+    read replica, or the primary when there is none or the user wrote recently.
+    """
+    index = None
+    if replica_router.engines:
+        if not await is_pinned_to_primary(token_subject(request.headers.get("Authorization"))):
+            index = replica_router.choose()
+    if index is None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+    
+    async with replica_router.sessionmakers[index]() as db:
+        try:
+            yield db
+        except (OperationalError, InterfaceError):
+            # Connection failures take the replica out of rotation until the
+            # next successful health check
+            replica_router.mark_unhealthy(index)
+            raise
+
+
+async def get_current_user(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+) -> models.User:
+    """
+    Validate access token and return current user.
+    """
+    token_data = decode_access_token(token)
+    result = await db.execute(
+        select(models.User)
+        .options(joinedload(models.User.shipping_address))
+        .where(models.User.id == token_data.sub)
+    )
+    user = result.scalars().first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
@@ -38,6 +108,80 @@ def get_current_user(
     return user
 
 
+async def load_principal(db: AsyncSession, user_id: str) -> schemas.UserPrincipal:
+    """
+    Return a user's id, email and flags from a short-lived cache keyed by user
+    id (invalidated by user updates), loading them from the database on a miss.
+    """
+    async def load():
+        result = await db.execute(select(
+            models.User.id, models.User.email, models.User.is_active, models.User.is_admin
+        ).where(models.User.id == user_id))
+        user = result.first()
+        if not user:
+            return None, []
+        principal = {
+            "id": user.id,
+            "email": user.email,
+            "is_active": bool(user.is_active),
+            "is_admin": bool(user.is_admin),
+        }
+        return principal, [user_tag(user.id)]
+    
+    principal = await principal_cache.get_or_load(cache_key("principal", id=user_id), load)
+    if not principal:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+    return schemas.UserPrincipal(**principal)
+
+
+async def get_current_principal(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+) -> schemas.UserPrincipal:
+    """
+    Validate access token and return the current user's id, email and flags
+    without loading the full User row.
+    
+    Always reflects the user's current flags; use it for writes and admin checks.
+    """
+    token_data = decode_access_token(token)
+    return await load_principal(db, token_data.sub)
+
+
+async def get_current_read_principal(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+) -> schemas.UserPrincipal:
+    """
+    Like get_current_principal, for read-only endpoints: uses the claims
+    embedded in the token when JWT_EMBED_CLAIMS is enabled, so flag changes
+    only apply once the token is renewed.
+    """
+    token_data = decode_access_token(token)
+    if settings.JWT_EMBED_CLAIMS and token_data.email is not None:
+        return schemas.UserPrincipal(
+            id=token_data.sub,
+            email=token_data.email,
+            is_active=bool(token_data.is_active),
+            is_admin=bool(token_data.is_admin),
+        )
+    return await load_principal(db, token_data.sub)
+
+
+async def confirm_admin(principal: schemas.UserPrincipal) -> bool:
+    """
+    Whether the user of a principal is currently an active admin. Principals
+    of get_current_read_principal may carry stale token claims; check before
+    showing other users' data.
+    """
+    if not principal.is_admin:
+        return False
+    # The primary, so a demotion is seen even while replicas lag
+    async with AsyncSessionLocal() as db:
+        current = await load_principal(db, principal.id)
+    return current.is_admin and current.is_active
+
+
 def get_current_active_user(
     current_user: models.User = Depends(get_current_user),
 ) -> models.User:
@@ -51,6 +195,32 @@ def get_current_active_user(
     return current_user
 
 
+def get_current_active_principal(
+    current_user: schemas.UserPrincipal = Depends(get_current_principal),
+) -> schemas.UserPrincipal:
+    """
+    Get current active user's principal.
+    """
+    if not current_user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
+        )
+    return current_user
+
+
+def get_current_active_read_principal(
+    current_user: schemas.UserPrincipal = Depends(get_current_read_principal),
+) -> schemas.UserPrincipal:
+    """
+    Get current active user's principal, for read-only endpoints.
+    """
+    if not current_user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
+        )
+    return current_user
+
+
 def get_current_admin_user(
     current_user: models.User = Depends(get_current_user),
 ) -> models.User:
@@ -62,4 +232,19 @@ def get_current_admin_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="The user doesn't have enough privileges",
         )
-    return current_user 
\ No newline at end of file
+    return current_user
+
+
+def get_current_admin_principal(
+    current_user: schemas.UserPrincipal = Depends(get_current_principal),
+) -> schemas.UserPrincipal:
+    """
+    Get current admin user's principal.
+    """
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="The user doesn't have enough privileges",
+        )
+    return current_user
+
@@ -0,0 +1,114 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional, Sequence
+
+from fastapi import Request
+from sqlalchemy import Select, select
+from sqlalchemy.exc import InterfaceError, OperationalError
+from starlette.concurrency import run_in_threadpool
+
+from app import models
+from app.core.config import settings
+from app.db.session import async_engine, replica_router
+
+# Exported columns of each dataset; orders are exported one row per order item
+EXPORT_COLUMNS = {
+    "books": [column for column in models.Book.__table__.columns if column.name != "search_vector"],
+    "orders": [
+        models.Order.id.label("order_id"),
+        models.Order.user_id,
+        models.Order.status,
+        models.Order.total_amount,
+        models.Order.created_at,
+        models.Order.updated_at,
+        models.OrderItem.id.label("item_id"),
+        models.OrderItem.book_id,
+        models.OrderItem.quantity,
+        models.OrderItem.unit_price,
+    ],
+}
+
+# Same formats as catalog imports, so a books export can be imported elsewhere
+MEDIA_TYPES = {"jsonl": "application/x-ndjson", "csv": "text/csv"}
+
+
+def export_query(dataset: str, updated_since: Optional[datetime] = None) -> Select:
+    """
+    Core query for a dataset, optionally limited to rows updated since a time.
+    """
+    query = select(*EXPORT_COLUMNS[dataset])
+    model = models.Book if dataset == "books" else models.Order
+    if dataset == "orders":
+        query = query.select_from(models.OrderItem).join(models.Order)
+    if updated_since is not None:
+        if updated_since.tzinfo is not None:
+            # Timestamps are stored as naive UTC
+            updated_since = updated_since.astimezone(timezone.utc).replace(tzinfo=None)
+        query = query.where(model.updated_at >= updated_since)
+    return query
+
+
+def accepts_gzip(request: Request) -> bool:
+    return "gzip" in request.headers.get("accept-encoding", "").lower()
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def encode_rows(rows: Sequence[Sequence], keys: List[str], export_format: str) -> bytes:
+    """
+    Serialize a batch of rows as JSON lines or CSV records.
+    """
+    if export_format == "jsonl":
+        return "".join(
+            json.dumps(dict(zip(keys, row)), default=_json_default, separators=(",", ":")) + "\n"
+            for row in rows
+        ).encode()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(
+        [value.isoformat() if isinstance(value, datetime) else value for value in row] for row in rows
+    )
+    return buffer.getvalue().encode()
+
+
+async def stream_export(query: Select, export_format: str, compress: bool) -> AsyncIterator[bytes]:
+    """
+    Stream the rows of a query through a server-side cursor, in batches of
+    EXPORT_BATCH_SIZE rows, so memory use doesn't depend on the table size.
+    Reads from a read replica when there is one.
+    """
+    keys = [column.key for column in query.selected_columns]
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+    
+    def output(data: bytes) -> bytes:
+        return compressor.compress(data) if compressor else data
+    
+    if export_format == "csv":
+        header = io.StringIO()
+        csv.writer(header).writerow(keys)
+        yield output(header.getvalue().encode())
+    
+    index = replica_router.choose()
+    engine = async_engine if index is None else replica_router.engines[index]
+    try:
+        async with engine.connect() as conn:
+            result = await conn.stream(query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+            async for rows in result.partitions():
+                # Serializing and compressing a batch is CPU-bound; keep it off the event loop
+                chunk = await run_in_threadpool(lambda: output(encode_rows(rows, keys, export_format)))
+                if chunk:
+                    yield chunk
+    except (OperationalError, InterfaceError):
+        if index is not None:
+            replica_router.mark_unhealthy(index)
+        raise
+    
+    if compressor:
+        yield compressor.flush()
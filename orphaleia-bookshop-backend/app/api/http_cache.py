@@ -0,0 +1,82 @@
+import hashlib
+from typing import Any, Iterable, Optional
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+
+
+def _digest(parts: Iterable[Any]) -> str:
+    hasher = hashlib.sha1()
+    for part in parts:
+        hasher.update(str(part).encode())
+        hasher.update(b"\x00")
+    return hasher.hexdigest()
+
+
+def strong_etag(*parts: Any) -> str:
+    """
+    ETag for a single resource whose representation is fully determined by parts.
+    """
+    return f'"{_digest(parts)}"'
+
+
+def weak_etag(*parts: Any) -> str:
+    """
+    ETag for a listing that is semantically (not byte-for-byte) determined by parts.
+    """
+    return f'W/"{_digest(parts)}"'
+
+
+def listing_etag(request: Request, versions: Iterable[Any]) -> str:
+    """
+    Weak ETag for a listing page from the request query and the (id, updated_at)
+    of every book on the page.
+    """
+    query = sorted(request.query_params.multi_items())
+    return weak_etag(request.url.path, query, *(tuple(version) for version in versions))
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check the If-None-Match header against an ETag (weak comparison).
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def cache_control_for(route: str) -> Optional[str]:
+    """
+    Cache-Control value configured for a route in settings.HTTP_CACHE_CONTROL.
+    """
+    return settings.HTTP_CACHE_CONTROL.get(route)
+
+
+def set_cache_headers(response: Response, etag: str, route: str) -> None:
+    """
+    Set the ETag and configured Cache-Control headers on a response.
+    """
+    response.headers["ETag"] = etag
+    cache_control = cache_control_for(route)
+    if cache_control:
+        response.headers["Cache-Control"] = cache_control
+
+
+def not_modified(etag: str, route: str) -> Response:
+    """
+    Empty 304 response for a request whose If-None-Match matched.
+    """
+    response = Response(status_code=304)
+    set_cache_headers(response, etag, route)
+    return response
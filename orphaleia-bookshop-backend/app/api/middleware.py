@@ -0,0 +1,141 @@
+import time
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.deps import pin_to_primary, token_subject
+from app.core.config import settings
+from app.core.metrics import (
+    REQUEST_DB_QUERIES,
+    REQUEST_DB_SECONDS,
+    REQUEST_LATENCY,
+    REQUEST_SIZE,
+    REQUESTS_IN_FLIGHT,
+    RESPONSE_SIZE,
+    RequestDbStats,
+    request_db_stats,
+)
+from app.core.query_budget import QueryLog, check_budget, request_query_log
+from app.db.session import replica_router
+
+# Methods that never write, so they don't need read-your-writes pinning
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pin the authenticated user to the primary database after a successful
+    write, so their next reads don't hit a replica that is lagging behind.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or not replica_router.engines:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_pin(message: Message) -> None:
+            # Pin before the client sees the response and can issue a read
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                user_id = token_subject(Headers(scope=scope).get("authorization"))
+                if user_id:
+                    await pin_to_primary(user_id)
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin)
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Path template of the route that handled the request, e.g.
+    /api/v1/books/{book_id}, or "unmatched".
+    """
+    route = scope.get("route")
+    if route is None or not hasattr(route, "path_regex"):
+        return "unmatched"
+    # Routes of included routers may only know their path within the router;
+    # the prefix is whatever precedes the part of the path the route matched
+    path = scope["path"]
+    start = path.rfind("/")
+    while start >= 0:
+        if route.path_regex.match(path[start:]):
+            return path[:start] + route.path
+        start = path.rfind("/", 0, start)
+    return route.path
+
+
+class MetricsMiddleware:
+    """
+    Record latency, body sizes and SQL statements of every request, labelled
+    with the route template so paths with ids share a series.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        request_size = 0
+        response_size = 0
+
+        async def receive_counted() -> Message:
+            nonlocal request_size
+            message = await receive()
+            if message["type"] == "http.request":
+                request_size += len(message.get("body", b""))
+            return message
+
+        async def send_counted(message: Message) -> None:
+            nonlocal status, response_size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        db_stats = RequestDbStats()
+        token = request_db_stats.set(db_stats)
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive_counted, send_counted)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            request_db_stats.reset(token)
+            route = route_template(scope)
+            method = scope["method"]
+            REQUEST_LATENCY.labels(method, route, str(status)).observe(time.perf_counter() - start)
+            REQUEST_SIZE.labels(method, route).observe(request_size)
+            RESPONSE_SIZE.labels(method, route).observe(response_size)
+            REQUEST_DB_QUERIES.labels(method, route).observe(db_stats.queries)
+            REQUEST_DB_SECONDS.labels(method, route).observe(db_stats.seconds)
+
+
+class QueryBudgetMiddleware:
+    """
+    Record the SQL statements of every request and check them against the
+    budget declared on its endpoint with @query_budget.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        log = QueryLog()
+        token = request_query_log.set(log)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_query_log.reset(token)
+        budget = getattr(scope.get("endpoint"), "query_budget", settings.QUERY_BUDGET_DEFAULT)
+        check_budget(route_template(scope), budget, log)
@@ -0,0 +1,99 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import DateTime, Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+# Response header carrying the cursor of the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_key: str, values: Sequence[Any]) -> str:
+    """
+    Encode the sort key values of the last row of a page as an opaque cursor.
+    """
+    payload = {
+        "s": sort_key,
+        "v": [v.isoformat() if isinstance(v, datetime) else v for v in values],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(
+    cursor: str, sort_key: str, columns: Sequence[InstrumentedAttribute]
+) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor() for the same sort key.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if payload["s"] != sort_key or len(payload["v"]) != len(columns):
+            raise ValueError(cursor)
+        values = []
+        for column, value in zip(columns, payload["v"]):
+            # Tampered cursors must not reach the keyset comparison
+            if isinstance(column.type, DateTime):
+                if not isinstance(value, str):
+                    raise ValueError(value)
+                value = datetime.fromisoformat(value)
+            elif isinstance(value, bool) or not isinstance(value, (str, int, float)):
+                raise ValueError(value)
+            values.append(value)
+        return values
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def apply_keyset(
+    query: Select,
+    columns: Sequence[InstrumentedAttribute],
+    sort_key: str,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+) -> Select:
+    """
+    Order a query by the keyset columns and, given a cursor, start after the
+    row it points to. The last column must be unique (usually the id).
+    """
+    if cursor:
+        values = decode_cursor(cursor, sort_key, columns)
+        if descending:
+            query = query.where(tuple_(*columns) < tuple(values))
+        else:
+            query = query.where(tuple_(*columns) > tuple(values))
+    return query.order_by(*(c.desc() if descending else c.asc() for c in columns))
+
+
+async def fetch_page(
+    db: AsyncSession,
+    query: Select,
+    columns: Sequence[InstrumentedAttribute],
+    sort_key: str,
+    limit: int,
+    scalars: bool = True,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page and the cursor of the next one (None on the last page).
+    Pass scalars=False for queries selecting columns rather than an entity.
+    """
+    result = await db.execute(query.limit(limit + 1))
+    rows = result.scalars().all() if scalars else result.all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(sort_key, [getattr(last, column.key) for column in columns])
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    """
+    Expose the next page cursor in the response headers.
+    """
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
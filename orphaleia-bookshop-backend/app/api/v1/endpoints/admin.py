@@ -0,0 +1,43 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from app import schemas
+from app.api import deps
+from app.core.cache import catalog_cache, principal_cache
+from app.db.session import async_engine, replica_router
+
+router = APIRouter()
+
+
+@router.get("/cache", response_model=dict)
+def read_cache_stats(
+    current_user: schemas.UserPrincipal = Depends(deps.get_current_admin_principal),
+) -> Any:
+    """
+    Get cache hit/miss/eviction counters (admin only).
+    """
+    return {"catalog": catalog_cache.stats(), "principal": principal_cache.stats()}
+
+
+@router.get("/replicas", response_model=list)
+def read_replica_health(
+    current_user: schemas.UserPrincipal = Depends(deps.get_current_admin_principal),
+) -> Any:
+    """
+    Get the health of the read replicas (admin only).
+    """
+    return replica_router.stats()
+
+
+@router.get("/db-pool", response_model=dict)
+def read_db_pool_stats(
+    current_user: schemas.UserPrincipal = Depends(deps.get_current_admin_principal),
+) -> Any:
+    """
+    Get connection pool gauges and checkout wait times of this worker (admin only).
+    """
+    return {
+        "primary": async_engine.pool.stats(),
+        "replicas": [engine.pool.stats() for engine in replica_router.engines],
+    }
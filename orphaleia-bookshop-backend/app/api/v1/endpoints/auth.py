@@ -2,44 +2,61 @@ from typing import Any
 
 from fastapi import APIRouter, Body, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models, schemas
 from app.api import deps
 from app.core import security
-from app.core.security import get_password_hash, verify_password
+from app.core.config import settings
+from app.core.security import get_password_hash_async, verify_and_update_password_async
 
 router = APIRouter()
 
 
 @router.post("/login", response_model=schemas.Token)
-def login(
-    db: Session = Depends(deps.get_db), form_data: OAuth2PasswordRequestForm = Depends()
+async def login(
+    db: AsyncSession = Depends(deps.get_async_db), form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests
     """
-    user = db.query(models.User).filter(models.User.email == form_data.username).first()
+    user = await db.scalar(
+        select(models.User).where(models.User.email == form_data.username)
+    )
     if not user:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
-    if not verify_password(form_data.password, user.hashed_password):
+    valid, new_hash = await verify_and_update_password_async(form_data.password, user.hashed_password)
+    if not valid:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
+    
+    # Transparently rehash passwords stored with an outdated bcrypt cost
+    if new_hash:
+        user.hashed_password = new_hash
+        db.add(user)
+        await db.commit()
+    
+    claims = None
+    if settings.JWT_EMBED_CLAIMS:
+        claims = {"email": user.email, "is_active": user.is_active, "is_admin": user.is_admin}
     return {
-        "access_token": security.create_access_token(user.id),
+        "access_token": security.create_access_token(user.id, claims=claims),
         "token_type": "bearer",
     }
 
 
 @router.post("/register", response_model=schemas.User)
-def register(
+async def register(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     user_in: schemas.UserCreate,
 ) -> Any:
     """
     Register a new user.
     """
-    user = db.query(models.User).filter(models.User.email == user_in.email).first()
+    user = await db.scalar(
+        select(models.User).where(models.User.email == user_in.email)
+    )
     if user:
         raise HTTPException(
             status_code=400,
@@ -50,11 +67,11 @@ def register(
     user = models.User(
         id=user_id,
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await get_password_hash_async(user_in.password),
         full_name=user_in.full_name,
         is_admin=user_in.is_admin,
+        shipping_address=None,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
     return user 
\ No newline at end of file
@@ -1,74 +1,191 @@
-from typing import Any, List, Optional
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import or_
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy import Row, Select, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
 
 from app import models, schemas
 from app.api import deps
+from app.api.http_cache import (
+    etag_matches,
+    listing_etag,
+    not_modified,
+    set_cache_headers,
+    strong_etag,
+)
+from app.api.pagination import apply_keyset, fetch_page, set_next_cursor
+from app.core.cache import FACETS_TAG, FEATURED_TAG, book_tag, cache_key, catalog_cache, category_tag
+from app.core.query_budget import query_budget
 from app.core.security import generate_uuid
+from app.core.suggest import suggest_index
+from app.db.crud.book import book_cache_key, get_cached_books, serialize_books
+from app.db.facets import count_facets
+from app.db.search import apply_search
 
 router = APIRouter()
 
 
+# Keyset columns and direction for each sort option; id breaks ties
+BOOK_SORTS = {
+    "title-asc": ((models.Book.title, models.Book.id), False),
+    "title-desc": ((models.Book.title, models.Book.id), True),
+    "price-asc": ((models.Book.price, models.Book.id), False),
+    "price-desc": ((models.Book.price, models.Book.id), True),
+}
+
+
+# Book fields that facet counts are grouped or filtered by
+FACET_FIELDS = {"category", "format", "price", "featured", "title", "author", "description"}
+
+# Book fields a listing can be narrowed to with `fields`
+BOOK_FIELDS = tuple(schemas.Book.model_fields)
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Requested book fields, always starting with the id, or None for full books.
+    """
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in BOOK_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return ["id", *(field for field in dict.fromkeys(requested) if field != "id")]
+
+
+def serialize_book_fields(rows: List[Row], fields: List[str]) -> List[dict]:
+    """
+    Serialize the given fields of book column rows.
+    """
+    books = []
+    for row in rows:
+        book = {field: row._mapping[field] for field in fields}
+        for field, value in book.items():
+            if isinstance(value, datetime):
+                book[field] = value.isoformat()
+        books.append(book)
+    return books
+
+
+def filter_books(
+    query: Select,
+    db: AsyncSession,
+    category: Optional[str] = None,
+    search: Optional[str] = None,
+    featured: Optional[bool] = None,
+) -> Tuple[Select, Optional[ColumnElement]]:
+    """
+    Apply the filters of the book listings to a Book query. Returns the query
+    and the search relevance expression (None without a search).
+    """
+    # Filter by category
+    if category and category != "all":
+        query = query.where(models.Book.category == category)
+    
+    # Filter by search query
+    rank = None
+    if search:
+        query, rank = apply_search(query, search, db.get_bind().dialect.name)
+    
+    # Filter by featured
+    if featured is not None:
+        query = query.where(models.Book.featured == featured)
+    return query, rank
+
+
 @router.get("/", response_model=List[schemas.Book])
-def read_books(
-    db: Session = Depends(deps.get_db),
+@query_budget(2)
+async def read_books(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     category: Optional[str] = None,
     search: Optional[str] = None,
     sort: Optional[str] = None,
     featured: Optional[bool] = None,
+    fields: Optional[str] = None,
 ) -> Any:
     """
     Retrieve books with optional filtering.
-    """
-    query = db.query(models.Book)
     
-    # Filter by category
-    if category and category != "all":
-        query = query.filter(models.Book.category == category)
+    Valid sort values are: "title-asc", "title-desc", "price-asc", "price-desc", "relevance"
     
-    # Filter by search query
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                models.Book.title.ilike(search_term),
-                models.Book.author.ilike(search_term),
-                models.Book.description.ilike(search_term),
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the next page;
+    `skip` is still accepted for offset pagination.
+    
+    `fields` is a comma-separated list of book fields (e.g. "title,author,price,cover,stock")
+    to return instead of full books; only those columns are selected. The id is always included.
+    """
+    selected = parse_fields(fields)
+    query, rank = filter_books(select(models.Book), db, category, search, featured)
+    
+    # Relevance ranking is computed per query, so it only supports offset pagination
+    if sort == "relevance":
+        if cursor:
+            raise HTTPException(
+                status_code=400, detail="Cursor pagination is not supported for relevance sorting"
             )
+        if rank is not None:
+            query = query.order_by(rank.desc())
+        query = query.order_by(models.Book.title.asc(), models.Book.id.asc()).offset(skip)
+    else:
+        # Apply sorting (default: title ascending)
+        sort_key = sort if sort in BOOK_SORTS else "title-asc"
+        columns, descending = BOOK_SORTS[sort_key]
+        query = apply_keyset(query, columns, sort_key, cursor, descending)
+        if not cursor:
+            query = query.offset(skip)
+    
+    # Revalidate from the (id, updated_at) of the page without loading full rows
+    if request.headers.get("if-none-match"):
+        versions = (await db.execute(
+            query.with_only_columns(models.Book.id, models.Book.updated_at).limit(limit)
+        )).all()
+        etag = listing_etag(request, versions)
+        if etag_matches(request, etag):
+            return not_modified(etag, "read_books")
+    
+    if selected:
+        # Select plain columns, skipping ORM instances; the ETag and the next
+        # cursor need updated_at and the sort columns as well
+        keyset = [column.key for column in columns] if sort != "relevance" else []
+        query = query.with_only_columns(
+            *(getattr(models.Book, field) for field in dict.fromkeys([*selected, "updated_at", *keyset]))
         )
     
-    # Filter by featured
-    if featured is not None:
-        query = query.filter(models.Book.featured == featured)
-    
-    # Apply sorting
-    if sort:
-        if sort == "title-asc":
-            query = query.order_by(models.Book.title.asc())
-        elif sort == "title-desc":
-            query = query.order_by(models.Book.title.desc())
-        elif sort == "price-asc":
-            query = query.order_by(models.Book.price.asc())
-        elif sort == "price-desc":
-            query = query.order_by(models.Book.price.desc())
+    next_cursor = None
+    if sort == "relevance":
+        result = await db.execute(query.limit(limit))
+        books = result.all() if selected else result.scalars().all()
     else:
-        # Default sorting
-        query = query.order_by(models.Book.title.asc())
+        books, next_cursor = await fetch_page(db, query, columns, sort_key, limit, scalars=not selected)
     
-    books = query.offset(skip).limit(limit).all()
-    return books
+    etag = listing_etag(request, ((book.id, book.updated_at) for book in books))
+    if not selected:
+        set_next_cursor(response, next_cursor)
+        set_cache_headers(response, etag, "read_books")
+        return books
+    
+    # Partial books would fail response_model validation; serialize them directly
+    lean = JSONResponse(serialize_book_fields(books, selected))
+    set_next_cursor(lean, next_cursor)
+    set_cache_headers(lean, etag, "read_books")
+    return lean
 
 
 @router.post("/", response_model=schemas.Book)
-def create_book(
+async def create_book(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     book_in: schemas.BookCreate,
-    current_user: models.User = Depends(deps.get_current_admin_user),
+    current_user: schemas.UserPrincipal = Depends(deps.get_current_admin_principal),
 ) -> Any:
     """
     Create new book (admin only).
@@ -76,91 +193,255 @@ def create_book(
     book_id = book_in.id if book_in.id else generate_uuid()
     book = models.Book(id=book_id, **book_in.dict(exclude={"id"}))
     db.add(book)
-    db.commit()
-    db.refresh(book)
+    await db.commit()
+    await db.refresh(book)
+    suggest_index.add_book(book.id, book.title, book.author)
+    
+    # New book can appear in its category listings, the featured books and the facet counts
+    tags = [category_tag(book.category), FACETS_TAG]
+    if book.featured:
+        tags.append(FEATURED_TAG)
+    await catalog_cache.invalidate_tags(tags)
+    # Replicas may not have the change yet; read the catalog from the primary
+    await deps.pin_to_primary()
     return book
 
 
+@router.post("/batch", response_model=schemas.BookBatchResponse)
+@query_budget(1)
+async def read_books_batch(
+    batch_in: schemas.BookBatchRequest,
+    db: AsyncSession = Depends(deps.get_read_db),
+) -> Any:
+    """
+    Get many books by id at once (e.g. to show a cart), in request order.
+    
+    Ids that match no book are returned with `found: false`.
+    """
+    books = await get_cached_books(db, batch_in.ids)
+    return {
+        "books": [
+            {"id": book_id, "found": book_id in books, "book": books.get(book_id)}
+            for book_id in batch_in.ids
+        ]
+    }
+
+
 @router.get("/featured", response_model=List[schemas.Book])
-def read_featured_books(
-    db: Session = Depends(deps.get_db),
+@query_budget(1)
+async def read_featured_books(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
     limit: int = 8,
 ) -> Any:
     """
     Get featured books.
     """
-    books = db.query(models.Book).filter(models.Book.featured == True).limit(limit).all()
+    async def load():
+        books = (await db.execute(
+            select(models.Book).where(models.Book.featured == True).limit(limit)
+        )).scalars().all()
+        return serialize_books(books), [FEATURED_TAG, *(book_tag(book.id) for book in books)]
+    
+    books = await catalog_cache.get_or_load(cache_key("featured", limit=limit), load)
+    
+    etag = listing_etag(request, ((book["id"], book["updated_at"]) for book in books))
+    if etag_matches(request, etag):
+        return not_modified(etag, "read_featured_books")
+    set_cache_headers(response, etag, "read_featured_books")
     return books
 
 
+@router.get("/facets", response_model=schemas.BookFacets)
+@query_budget(1)
+async def read_book_facets(
+    db: AsyncSession = Depends(deps.get_read_db),
+    category: Optional[str] = None,
+    search: Optional[str] = None,
+    featured: Optional[bool] = None,
+) -> Any:
+    """
+    Get the number of books per category, format and price band among the
+    books matching the same filters as the book listing.
+    """
+    # Equivalent filters share a cache entry
+    if category == "all":
+        category = None
+    search = " ".join(search.lower().split()) if search else None
+    
+    async def load():
+        query, _ = filter_books(select(models.Book), db, category, search, featured)
+        return await count_facets(db, query), [FACETS_TAG]
+    
+    key = cache_key("facets", category=category, search=search or None, featured=featured)
+    return await catalog_cache.get_or_load(key, load)
+
+
+@router.get("/suggest", response_model=List[schemas.Suggestion])
+@query_budget(1)
+async def suggest_books(
+    db: AsyncSession = Depends(deps.get_read_db),
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+) -> Any:
+    """
+    Autocomplete book titles and author names as the user types.
+    
+    Served from the in-memory index, which tolerates typos; until it is built
+    (right after startup), titles and authors starting with q are looked up
+    in the database instead.
+    """
+    if suggest_index.ready:
+        return suggest_index.suggest(q, limit)
+    
+    prefix = q.strip().lower()
+    rows = (await db.execute(
+        select(models.Book.id, models.Book.title, models.Book.author)
+        .where(or_(
+            func.lower(models.Book.title).startswith(prefix, autoescape=True),
+            func.lower(models.Book.author).startswith(prefix, autoescape=True),
+        ))
+        .limit(limit)
+    )).all()
+    suggestions = {}
+    for row in rows:
+        if row.title.lower().startswith(prefix):
+            # A title shared by several books links to none of them
+            key = ("title", row.title)
+            book_id = None if key in suggestions else row.id
+            suggestions[key] = {"text": row.title, "kind": "title", "book_id": book_id}
+        if row.author.lower().startswith(prefix):
+            suggestions[("author", row.author)] = {"text": row.author, "kind": "author", "book_id": None}
+    return sorted(suggestions.values(), key=lambda s: (len(s["text"]), s["text"]))[:limit]
+
+
 @router.get("/category/{category}", response_model=List[schemas.Book])
-def read_books_by_category(
+@query_budget(1)
+async def read_books_by_category(
     category: str,
-    db: Session = Depends(deps.get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
 ) -> Any:
     """
     Get books by category.
     """
-    books = db.query(models.Book).filter(models.Book.category == category).offset(skip).limit(limit).all()
-    return books
+    async def load():
+        columns, descending = BOOK_SORTS["title-asc"]
+        query = select(models.Book).where(models.Book.category == category)
+        query = apply_keyset(query, columns, "title-asc", cursor, descending)
+        if not cursor:
+            query = query.offset(skip)
+        books, next_cursor = await fetch_page(db, query, columns, "title-asc", limit)
+        page = {"books": serialize_books(books), "next_cursor": next_cursor}
+        return page, [category_tag(category), *(book_tag(book.id) for book in books)]
+    
+    key = cache_key("category", category=category, skip=0 if cursor else skip, limit=limit, cursor=cursor)
+    page = await catalog_cache.get_or_load(key, load)
+    
+    etag = listing_etag(request, ((book["id"], book["updated_at"]) for book in page["books"]))
+    if etag_matches(request, etag):
+        return not_modified(etag, "read_books_by_category")
+    set_cache_headers(response, etag, "read_books_by_category")
+    set_next_cursor(response, page["next_cursor"])
+    return page["books"]
 
 
 @router.get("/{book_id}", response_model=schemas.Book)
-def read_book(
+@query_budget(1)
+async def read_book(
     *,
-    db: Session = Depends(deps.get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
     book_id: str,
 ) -> Any:
     """
     Get book by ID.
     """
-    book = db.query(models.Book).filter(models.Book.id == book_id).first()
+    async def load():
+        book = await db.get(models.Book, book_id)
+        if not book:
+            return None, []
+        return serialize_books([book])[0], [book_tag(book.id)]
+    
+    book = await catalog_cache.get_or_load(book_cache_key(book_id), load)
     if not book:
         raise HTTPException(status_code=404, detail="Book not found")
+    
+    etag = strong_etag(book["id"], book["updated_at"])
+    if etag_matches(request, etag):
+        return not_modified(etag, "read_book")
+    set_cache_headers(response, etag, "read_book")
     return book
 
 
 @router.put("/{book_id}", response_model=schemas.Book)
-def update_book(
+async def update_book(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     book_id: str,
     book_in: schemas.BookUpdate,
-    current_user: models.User = Depends(deps.get_current_admin_user),
+    current_user: schemas.UserPrincipal = Depends(deps.get_current_admin_principal),
 ) -> Any:
     """
     Update a book (admin only).
     """
-    book = db.query(models.Book).filter(models.Book.id == book_id).first()
+    book = await db.get(models.Book, book_id)
     if not book:
         raise HTTPException(status_code=404, detail="Book not found")
     
     update_data = book_in.dict(exclude_unset=True)
+    # Listings the book enters, or moves within, need dropping as well as
+    # the cached entries that already contain it
+    tags = [book_tag(book.id)]
+    if "category" in update_data or "title" in update_data:
+        tags.append(category_tag(book.category))
+        tags.append(category_tag(update_data.get("category", book.category)))
+    if update_data.get("featured", book.featured) != book.featured:
+        tags.append(FEATURED_TAG)
+    if FACET_FIELDS.intersection(update_data):
+        tags.append(FACETS_TAG)
+    
     for field, value in update_data.items():
         setattr(book, field, value)
     
     db.add(book)
-    db.commit()
-    db.refresh(book)
+    await db.commit()
+    await db.refresh(book)
+    if "title" in update_data or "author" in update_data:
+        suggest_index.add_book(book.id, book.title, book.author)
+    await catalog_cache.invalidate_tags(tags)
+    await deps.pin_to_primary()
     return book
 
 
 @router.delete("/{book_id}", response_model=schemas.Book)
-def delete_book(
+async def delete_book(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     book_id: str,
-    current_user: models.User = Depends(deps.get_current_admin_user),
+    current_user: schemas.UserPrincipal = Depends(deps.get_current_admin_principal),
 ) -> Any:
     """
     Delete a book (admin only).
     """
-    book = db.query(models.Book).filter(models.Book.id == book_id).first()
+    book = await db.get(models.Book, book_id)
     if not book:
         raise HTTPException(status_code=404, detail="Book not found")
     
-    db.delete(book)
-    db.commit()
+    # Later pages of its category shift once the book is gone
+    tags = [book_tag(book.id), category_tag(book.category), FACETS_TAG]
+    if book.featured:
+        tags.append(FEATURED_TAG)
+    
+    await db.delete(book)
+    await db.commit()
+    suggest_index.remove_book(book.id)
+    await catalog_cache.invalidate_tags(tags)
+    await deps.pin_to_primary()
     return book
\ No newline at end of file
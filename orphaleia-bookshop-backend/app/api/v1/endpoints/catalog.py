@@ -0,0 +1,144 @@
+import os
+import tempfile
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import schemas
+from app.api import deps
+from app.api.export import EXPORT_COLUMNS, MEDIA_TYPES, accepts_gzip, export_query, stream_export
+from app.core import jobs
+from app.core.config import settings
+from app.db.crud import import_job as crud_import_job
+
+router = APIRouter()
+
+
+# Upload formats by Content-Type
+IMPORT_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+    "application/x-jsonlines": "jsonl",
+}
+
+
+async def save_upload(request: Request, suffix: str) -> str:
+    """
+    Stream the request body to a temporary file, without holding it in memory.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length:
+        # Only a hint to fail early: the limit is enforced on the streamed bytes
+        try:
+            declared_size = int(content_length)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid Content-Length header")
+        if declared_size > settings.CATALOG_IMPORT_MAX_BYTES:
+            raise HTTPException(status_code=413, detail="Upload too large")
+    
+    fd, path = tempfile.mkstemp(prefix="catalog-import-", suffix=suffix, dir=settings.CATALOG_IMPORT_DIR)
+    try:
+        size = 0
+        with os.fdopen(fd, "wb") as f:
+            async for chunk in request.stream():
+                size += len(chunk)
+                if size > settings.CATALOG_IMPORT_MAX_BYTES:
+                    raise HTTPException(status_code=413, detail="Upload too large")
+                f.write(chunk)
+        if not size:
+            raise HTTPException(status_code=400, detail="Empty upload")
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+@router.post("/import", response_model=schemas.ImportJob, status_code=202)
+async def import_catalog(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_async_db),
+    format: Optional[str] = None,
+    current_user: schemas.UserPrincipal = Depends(deps.get_current_admin_principal),
+) -> Any:
+    """
+    Bulk import books (admin only).
+    
+    The request body is a CSV file (with a header row) or NDJSON, one book per
+    line, with the fields of a book; set the Content-Type header or pass
+    `format` as "csv" or "jsonl". Books are upserted by ISBN in the background;
+    poll the returned job for progress and row errors.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    file_format = format or IMPORT_CONTENT_TYPES.get(content_type)
+    if file_format not in ("csv", "jsonl"):
+        raise HTTPException(
+            status_code=415, detail="Upload CSV (text/csv) or NDJSON (application/x-ndjson)"
+        )
+    
+    path = await save_upload(request, f".{file_format}")
+    try:
+        job = await crud_import_job.create_import_job(db, current_user.id, file_format)
+    except BaseException:
+        os.remove(path)
+        raise
+    jobs.start_catalog_import(job.id, path, file_format)
+    return job
+
+
+@router.get("/import/{job_id}", response_model=schemas.ImportJob)
+async def read_import_job(
+    job_id: str,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: schemas.UserPrincipal = Depends(deps.get_current_admin_principal),
+) -> Any:
+    """
+    Get the progress and row errors of an import (admin only).
+    """
+    job = await crud_import_job.get_import_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
+
+
+@router.get("/export")
+async def export_catalog(
+    request: Request,
+    dataset: str = "books",
+    format: str = "jsonl",
+    updated_since: Optional[datetime] = None,
+    current_user: schemas.UserPrincipal = Depends(deps.get_current_admin_principal),
+) -> Any:
+    """
+    Stream the whole catalog (admin only).
+    
+    `dataset` is "books" or "orders" (one row per order item), `format` is
+    "jsonl" or "csv". With `updated_since`, only rows updated at or after that
+    time are exported; the X-Export-Started-At response header is the value to
+    pass for the next incremental export. The response is gzip-compressed when
+    the client accepts it.
+    """
+    if dataset not in EXPORT_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"Unknown dataset: {dataset}")
+    if format not in MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unknown format: {format}")
+    
+    # Rows updated while the export runs may or may not be included, so the
+    # next incremental export starts from here
+    started_at = datetime.utcnow()
+    compress = accepts_gzip(request)
+    headers = {
+        "Content-Disposition": f'attachment; filename="{dataset}.{format}"',
+        "X-Export-Started-At": started_at.isoformat(),
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    return StreamingResponse(
+        stream_export(export_query(dataset, updated_since), format, compress),
+        media_type=MEDIA_TYPES[format],
+        headers=headers,
+    )
@@ -1,159 +1,161 @@
-from typing import Any, List
+from typing import Any, List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app import models, schemas
 from app.api import deps
-from app.core.security import generate_uuid
+from app.api.pagination import apply_keyset, fetch_page, set_next_cursor
+from app.core.query_budget import query_budget
+from app.db.crud import idempotency as crud_idempotency
+from app.db.crud import order as crud_order
 
 router = APIRouter()
 
 
 @router.post("/", response_model=schemas.Order)
-def create_order(
+async def create_order(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     order_in: schemas.OrderCreate,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    current_user: schemas.UserPrincipal = Depends(deps.get_current_active_principal),
 ) -> Any:
     """
     Create new order.
-    """
-    # Calculate total amount based on cart items
-    total_amount = 0
-    order_items = []
-    total_items = 0
-    
-    for item in order_in.items:
-        book = db.query(models.Book).filter(models.Book.id == item.book_id).first()
-        if not book:
-            raise HTTPException(status_code=404, detail=f"Book with ID {item.book_id} not found")
-        
-        # Check if book is in stock
-        if book.stock < item.quantity:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Not enough stock for book '{book.title}'. Available: {book.stock}"
-            )
-        
-        total_amount += book.price * item.quantity
-        total_items += item.quantity
-        
-        # Create order item
-        order_items.append({
-            "book_id": item.book_id,
-            "quantity": item.quantity,
-            "unit_price": book.price
-        })
-        
-        # Update book stock
-        book.stock -= item.quantity
-        db.add(book)
     
-    # Create order
-    order_id = generate_uuid()
-    order = models.Order(
-        id=order_id,
-        user_id=current_user.id,
-        total_amount=total_amount,
-        shipping_address=order_in.shipping_address,
-        status="pending",
-        item_count=total_items
-    )
-    db.add(order)
-    db.commit()
-    db.refresh(order)
+    Send an Idempotency-Key header to make retries safe: repeating a request with
+    the same key returns the original order instead of placing a new one.
+    """
+    if idempotency_key:
+        stored = await crud_idempotency.get_idempotency_key(db, current_user.id, idempotency_key)
+        if stored:
+            return crud_idempotency.replay_response(stored, crud_idempotency.hash_request(order_in))
     
-    # Add order items
-    for item_data in order_items:
-        item = models.OrderItem(
-            id=generate_uuid(),
-            order_id=order.id,
-            **item_data
-        )
-        db.add(item)
+    return await crud_order.create_order(db, current_user.id, order_in, idempotency_key=idempotency_key)
+
+
+# Newest orders first; id breaks ties between orders created at the same instant
+ORDER_KEYSET = (models.Order.created_at, models.Order.id)
+
+
+async def read_orders_page(
+    db: AsyncSession,
+    query: Select,
+    response: Response,
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    summary: bool,
+) -> List[Any]:
+    """
+    Fetch one page of orders, with their items batch-loaded unless a summary is requested.
+    """
+    if not summary:
+        query = query.options(selectinload(models.Order.items))
     
-    db.commit()
-    db.refresh(order)
+    query = apply_keyset(query, ORDER_KEYSET, "created-desc", cursor, descending=True)
+    if not cursor:
+        query = query.offset(skip)
     
-    return order
+    orders, next_cursor = await fetch_page(db, query, ORDER_KEYSET, "created-desc", limit)
+    set_next_cursor(response, next_cursor)
+    if summary:
+        return [schemas.OrderSummary.model_validate(order) for order in orders]
+    return orders
 
 
-@router.get("/", response_model=List[schemas.Order])
-def read_orders(
-    db: Session = Depends(deps.get_db),
+@router.get("/", response_model=List[Union[schemas.Order, schemas.OrderSummary]])
+@query_budget(3)
+async def read_orders(
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    cursor: Optional[str] = None,
+    summary: bool = False,
+    current_user: schemas.UserPrincipal = Depends(deps.get_current_active_read_principal),
 ) -> Any:
     """
     Retrieve orders.
+    
+    With summary=true, orders are returned without their items.
     """
-    if current_user.is_admin:
-        # Admin can see all orders
-        orders = db.query(models.Order).offset(skip).limit(limit).all()
-    else:
+    query = select(models.Order)
+    if not await deps.confirm_admin(current_user):
         # Regular users can only see their own orders
-        orders = db.query(models.Order).filter(
-            models.Order.user_id == current_user.id
-        ).offset(skip).limit(limit).all()
+        query = query.where(models.Order.user_id == current_user.id)
     
-    return orders
+    return await read_orders_page(db, query, response, skip, limit, cursor, summary)
 
 
-@router.get("/user", response_model=List[schemas.Order])
-def read_user_orders(
-    db: Session = Depends(deps.get_db),
+@router.get("/user", response_model=List[Union[schemas.Order, schemas.OrderSummary]])
+@query_budget(3)
+async def read_user_orders(
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    cursor: Optional[str] = None,
+    summary: bool = False,
+    current_user: schemas.UserPrincipal = Depends(deps.get_current_active_read_principal),
 ) -> Any:
     """
     Retrieve current user's orders.
+    
+    With summary=true, orders are returned without their items.
     """
-    orders = db.query(models.Order).filter(
-        models.Order.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
+    query = select(models.Order).where(models.Order.user_id == current_user.id)
     
-    return orders
+    return await read_orders_page(db, query, response, skip, limit, cursor, summary)
 
 
 @router.get("/{order_id}", response_model=schemas.Order)
-def read_order(
+@query_budget(3)
+async def read_order(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     order_id: str,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: schemas.UserPrincipal = Depends(deps.get_current_active_read_principal),
 ) -> Any:
     """
     Get order by ID.
     """
-    order = db.query(models.Order).filter(models.Order.id == order_id).first()
+    order = (await db.execute(
+        select(models.Order).options(
+            selectinload(models.Order.items)
+        ).where(models.Order.id == order_id)
+    )).scalars().first()
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
     # Check permission
-    if order.user_id != current_user.id and not current_user.is_admin:
+    if order.user_id != current_user.id and not await deps.confirm_admin(current_user):
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     return order
 
 
 @router.put("/{order_id}", response_model=schemas.Order)
-def update_order(
+async def update_order(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     order_id: str,
     order_in: schemas.OrderUpdate,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: schemas.UserPrincipal = Depends(deps.get_current_active_principal),
 ) -> Any:
     """
     Update an order.
     
     Valid status values are: "pending", "processing", "shipped", "delivered", "cancelled"
     """
-    order = db.query(models.Order).filter(models.Order.id == order_id).first()
+    order = (await db.execute(
+        select(models.Order).options(
+            selectinload(models.Order.items)
+        ).where(models.Order.id == order_id)
+    )).scalars().first()
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
@@ -170,6 +172,6 @@ def update_order(
         setattr(order, field, value)
     
     db.add(order)
-    db.commit()
-    db.refresh(order)
+    await db.commit()
+    # The order and its items stay loaded after commit; no refresh needed
     return order 
\ No newline at end of file
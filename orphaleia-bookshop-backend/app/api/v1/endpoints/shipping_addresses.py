@@ -1,19 +1,21 @@
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
 
 from app import models, schemas
 from app.api import deps
+from app.core.query_budget import query_budget
 
 router = APIRouter()
 
 
 @router.get("/me", response_model=schemas.ShippingAddress)
-def read_shipping_address_me(
+@query_budget(1)
+async def read_shipping_address_me(
     current_user: models.User = Depends(deps.get_current_active_user),
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
 ) -> Any:
     """
     Get current user's shipping address.
@@ -27,9 +29,9 @@ def read_shipping_address_me(
 
 
 @router.post("/me", response_model=schemas.ShippingAddress)
-def create_shipping_address_me(
+async def create_shipping_address_me(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     shipping_address_in: schemas.ShippingAddressCreate,
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
@@ -55,15 +57,15 @@ def create_shipping_address_me(
         country=shipping_address_in.country,
     )
     db.add(shipping_address)
-    db.commit()
-    db.refresh(shipping_address)
+    await db.commit()
+    await db.refresh(shipping_address)
     return shipping_address
 
 
 @router.put("/me", response_model=schemas.ShippingAddress)
-def update_shipping_address_me(
+async def update_shipping_address_me(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     shipping_address_in: schemas.ShippingAddressUpdate,
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
@@ -86,15 +88,15 @@ def update_shipping_address_me(
         setattr(shipping_address, field, value)
     
     db.add(shipping_address)
-    db.commit()
-    db.refresh(shipping_address)
+    await db.commit()
+    await db.refresh(shipping_address)
     return shipping_address
 
 
 @router.delete("/me", response_model=schemas.ShippingAddress)
-def delete_shipping_address_me(
+async def delete_shipping_address_me(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
@@ -107,6 +109,6 @@ def delete_shipping_address_me(
         )
     
     shipping_address = current_user.shipping_address
-    db.delete(shipping_address)
-    db.commit()
+    await db.delete(shipping_address)
+    await db.commit()
     return shipping_address 
\ No newline at end of file
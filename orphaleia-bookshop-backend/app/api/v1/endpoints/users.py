@@ -3,16 +3,21 @@ from typing import Any, List
 from fastapi import APIRouter, Body, Depends, HTTPException
 from fastapi.encoders import jsonable_encoder
 from pydantic import EmailStr
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from app import models, schemas
 from app.api import deps
-from app.core.security import get_password_hash
+from app.core.cache import principal_cache, user_tag
+from app.core.query_budget import query_budget
+from app.core.security import get_password_hash_async
 
 router = APIRouter()
 
 
 @router.get("/me", response_model=schemas.User)
+@query_budget(1)
 def read_user_me(
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
@@ -23,9 +28,9 @@ def read_user_me(
 
 
 @router.put("/me", response_model=schemas.User)
-def update_user_me(
+async def update_user_me(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     full_name: str = Body(None),
     email: EmailStr = Body(None),
     password: str = Body(None),
@@ -45,7 +50,7 @@ def update_user_me(
     
     # Update the user
     if user_in.password:
-        hashed_password = get_password_hash(user_in.password)
+        hashed_password = await get_password_hash_async(user_in.password)
         current_user.hashed_password = hashed_password
     
     if user_in.email:
@@ -55,21 +60,25 @@ def update_user_me(
         current_user.full_name = user_in.full_name
     
     db.add(current_user)
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await principal_cache.invalidate_tags([user_tag(current_user.id)])
     return current_user
 
 
 @router.get("/{user_id}", response_model=schemas.User)
-def read_user_by_id(
+async def read_user_by_id(
     user_id: str,
     current_user: models.User = Depends(deps.get_current_active_user),
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
 ) -> Any:
     """
     Get a specific user by id.
     """
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = await db.scalar(
+        select(models.User)
+        .options(joinedload(models.User.shipping_address))
+        .where(models.User.id == user_id)
+    )
     if not user:
         raise HTTPException(
             status_code=404,
@@ -85,9 +94,9 @@ def read_user_by_id(
 
 
 @router.put("/{user_id}", response_model=schemas.User)
-def update_user(
+async def update_user(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     user_id: str,
     user_in: schemas.UserUpdate,
     current_user: models.User = Depends(deps.get_current_admin_user),
@@ -95,7 +104,11 @@ def update_user(
     """
     Update a user (admin only).
     """
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = await db.scalar(
+        select(models.User)
+        .options(joinedload(models.User.shipping_address))
+        .where(models.User.id == user_id)
+    )
     if not user:
         raise HTTPException(
             status_code=404,
@@ -104,7 +117,7 @@ def update_user(
     
     update_data = user_in.dict(exclude_unset=True)
     if update_data.get("password"):
-        hashed_password = get_password_hash(update_data["password"])
+        hashed_password = await get_password_hash_async(update_data["password"])
         del update_data["password"]
         update_data["hashed_password"] = hashed_password
     
@@ -112,6 +125,6 @@ def update_user(
         setattr(user, field, value)
     
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await principal_cache.invalidate_tags([user_tag(user.id)])
     return user 
\ No newline at end of file
@@ -1,53 +1,59 @@
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
+from app.core.query_budget import query_budget
 from app.db.crud import wishlist as crud_wishlist
-from app.models.user import User
-from app.models.book import Book
-from app.schemas.wishlist import WishlistItemCreate, WishlistItemWithBook
+from app.db.crud.book import get_cached_books
+from app.schemas.user import UserPrincipal
+from app.schemas.wishlist import (
+    WishlistCheckRequest,
+    WishlistCheckResponse,
+    WishlistItemCreate,
+    WishlistItemWithBook,
+)
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[WishlistItemWithBook])
-def get_wishlist(
-    db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user)
+@query_budget(2)
+async def get_wishlist(
+    db: AsyncSession = Depends(deps.get_async_db),
+    skip: int = 0,
+    limit: Optional[int] = None,
+    current_user: UserPrincipal = Depends(deps.get_current_read_principal)
 ):
     """
     Get the current user's wishlist
     """
-    items = crud_wishlist.get_wishlist_items(db, current_user.id)
-    # Convert DB model items to schema with loaded books
-    result = []
-    for item in items:
-        # Explicitly load the book for each wishlist item
-        book = db.query(Book).filter(Book.id == item.book_id).first()
-        wishlist_item_with_book = WishlistItemWithBook(
+    items = await crud_wishlist.get_wishlist_items(db, current_user.id, skip=skip, limit=limit)
+    # Books are loaded together with the items in a single query
+    return [
+        WishlistItemWithBook(
             id=item.id,
             user_id=item.user_id,
             book_id=item.book_id,
             added_at=item.added_at,
-            book=book
+            book=item.book
         )
-        result.append(wishlist_item_with_book)
-    return result
+        for item in items
+    ]
 
 
 @router.post("/", response_model=WishlistItemWithBook, status_code=status.HTTP_201_CREATED)
-def add_to_wishlist(
+async def add_to_wishlist(
     item_in: WishlistItemCreate,
-    db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user)
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: UserPrincipal = Depends(deps.get_current_principal)
 ):
     """
     Add a book to the current user's wishlist
     """
-    # Check if the book exists
-    book = db.query(Book).filter(Book.id == item_in.book_id).first()
+    # Check if the book exists (usually answered by the catalog cache)
+    book = (await get_cached_books(db, [item_in.book_id])).get(item_in.book_id)
     if not book:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -55,7 +61,7 @@ def add_to_wishlist(
         )
     
     # Add to wishlist
-    item = crud_wishlist.create_wishlist_item(db, current_user.id, item_in)
+    item = await crud_wishlist.create_wishlist_item(db, current_user.id, item_in)
     
     # Return with book details
     return WishlistItemWithBook(
@@ -68,15 +74,15 @@ def add_to_wishlist(
 
 
 @router.delete("/{book_id}", status_code=status.HTTP_204_NO_CONTENT)
-def remove_from_wishlist(
+async def remove_from_wishlist(
     book_id: str,
-    db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user)
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: UserPrincipal = Depends(deps.get_current_principal)
 ):
     """
     Remove a book from the current user's wishlist
     """
-    result = crud_wishlist.delete_wishlist_item(db, current_user.id, book_id)
+    result = await crud_wishlist.delete_wishlist_item(db, current_user.id, book_id)
     if not result:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -86,13 +92,31 @@ def remove_from_wishlist(
 
 
 @router.get("/check/{book_id}", response_model=dict)
-def check_wishlist_item(
+@query_budget(2)
+async def check_wishlist_item(
     book_id: str,
-    db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user)
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: UserPrincipal = Depends(deps.get_current_read_principal)
 ):
     """
     Check if a book is in the current user's wishlist
     """
-    exists = crud_wishlist.check_wishlist_item_exists(db, current_user.id, book_id)
-    return {"exists": exists} 
\ No newline at end of file
+    exists = await crud_wishlist.check_wishlist_item_exists(db, current_user.id, book_id)
+    return {"exists": exists}
+
+
+@router.post("/check", response_model=WishlistCheckResponse)
+@query_budget(2)
+async def check_wishlist_items(
+    check_in: WishlistCheckRequest,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: UserPrincipal = Depends(deps.get_current_read_principal)
+):
+    """
+    Check many books at once; returns the requested book ids that are in the
+    current user's wishlist, in request order
+    """
+    wishlisted = await crud_wishlist.get_wishlisted_book_ids(db, current_user.id, check_in.book_ids)
+    return WishlistCheckResponse(
+        book_ids=[book_id for book_id in dict.fromkeys(check_in.book_ids) if book_id in wishlisted]
+    )
\ No newline at end of file
@@ -0,0 +1,445 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(namespace: str, **params: Any) -> str:
+    """
+    Build a cache key from a namespace and normalized query parameters.
+    """
+    parts = [f"{name}={params[name]}" for name in sorted(params) if params[name] is not None]
+    return f"{namespace}?{'&'.join(parts)}"
+
+
+class CacheBackend:
+    """
+    Interface of the cache backends.
+
+    Entries carry a set of tags (e.g. the ids of the books they contain);
+    invalidating a tag drops every entry carrying it. Values must be
+    JSON-compatible so they can be shared between processes.
+    """
+
+    async def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, tags: Iterable[str] = (), generation: Optional[int] = None) -> None:
+        raise NotImplementedError
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped on every invalidation"""
+        raise NotImplementedError
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Tuple[Any, Iterable[str]]]]) -> Any:
+        """
+        Return the cached value for key, or await loader() for (value, tags) and cache it.
+
+        A value loaded while an invalidation happened is returned but not cached.
+        """
+        value = await self.get(key)
+        if value is not None:
+            return value
+        generation = self.generation
+        value, tags = await loader()
+        if value is not None:
+            await self.set(key, value, tags, generation=generation)
+        return value
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Cached values of those keys that are in the cache"""
+        values = {}
+        for key in keys:
+            value = await self.get(key)
+            if value is not None:
+                values[key] = value
+        return values
+
+    async def get_or_load_many(
+        self,
+        keys: Iterable[str],
+        loader: Callable[[List[str]], Awaitable[Dict[str, Tuple[Any, Iterable[str]]]]],
+    ) -> Dict[str, Any]:
+        """
+        Return the cached values for keys, loading all missing ones with a single
+        await loader(missing_keys) for {key: (value, tags)} and caching them.
+        Keys the loader has no value for are absent from the result.
+        """
+        keys = list(keys)
+        values = await self.get_many(keys)
+        missing = [key for key in keys if key not in values]
+        if not missing:
+            return values
+        generation = self.generation
+        for key, (value, tags) in (await loader(missing)).items():
+            if value is not None:
+                await self.set(key, value, tags, generation=generation)
+                values[key] = value
+        return values
+
+    async def start(self) -> None:
+        """Start background work (e.g. listening for invalidations)"""
+
+    async def stop(self) -> None:
+        """Stop background work"""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Thread-safe in-process LRU cache with a time-to-live per entry.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Any, frozenset]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    async def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value, _ = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    async def set(self, key: str, value: Any, tags: Iterable[str] = (), generation: Optional[int] = None) -> None:
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            entry_tags = frozenset(tags)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value, entry_tags)
+            for tag in entry_tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+                    self.invalidations += 1
+
+    async def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._tags.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key: str) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache shared by all workers through a Redis-protocol server.
+
+    Each worker keeps a small in-process copy of the entries it has read.
+    Invalidations delete the shared entries and are published on a pub/sub
+    channel so every worker drops its local copies as well. Redis errors are
+    logged and treated as cache misses.
+
+    Uses the asyncio Redis client, so cache round-trips don't block the
+    event loop.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        max_entries: int,
+        ttl_seconds: int,
+        client: Any = None,
+        channel: Optional[str] = None,
+    ):
+        if client is None:
+            try:
+                import redis.asyncio
+            except ImportError:
+                raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+            client = redis.asyncio.Redis.from_url(settings.REDIS_URL)
+        self.client = client
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.channel = channel or f"{settings.CACHE_INVALIDATION_CHANNEL}:{namespace}"
+        self.local = MemoryCacheBackend(max_entries, ttl_seconds)
+        # Identifies this worker's own messages on the invalidation channel
+        self.origin = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+        self.remote_hits = 0
+        self.remote_misses = 0
+        self.errors = 0
+
+    @property
+    def generation(self) -> int:
+        return self.local.generation
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:entry:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.namespace}:tag:{tag}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self.local.get(key)
+        if value is not None:
+            return value
+        try:
+            raw = await self.client.get(self._key(key))
+        except Exception:
+            self.errors += 1
+            logger.exception("Cache read from Redis failed")
+            return None
+        if raw is None:
+            self.remote_misses += 1
+            return None
+        self.remote_hits += 1
+        entry = json.loads(raw)
+        await self.local.set(key, entry["value"], entry["tags"])
+        return entry["value"]
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        keys = list(keys)
+        values = await self.local.get_many(keys)
+        missing = [key for key in keys if key not in values]
+        if not missing:
+            return values
+        try:
+            raws = await self.client.mget([self._key(key) for key in missing])
+        except Exception:
+            self.errors += 1
+            logger.exception("Cache read from Redis failed")
+            return values
+        for key, raw in zip(missing, raws):
+            if raw is None:
+                self.remote_misses += 1
+                continue
+            self.remote_hits += 1
+            entry = json.loads(raw)
+            await self.local.set(key, entry["value"], entry["tags"])
+            values[key] = entry["value"]
+        return values
+
+    async def set(self, key: str, value: Any, tags: Iterable[str] = (), generation: Optional[int] = None) -> None:
+        if generation is not None and generation != self.generation:
+            return
+        tags = list(tags)
+        await self.local.set(key, value, tags, generation=generation)
+        try:
+            pipe = self.client.pipeline()
+            pipe.set(self._key(key), json.dumps({"value": value, "tags": tags}), ex=self.ttl_seconds)
+            for tag in tags:
+                pipe.sadd(self._tag_key(tag), key)
+                pipe.expire(self._tag_key(tag), self.ttl_seconds)
+            await pipe.execute()
+        except Exception:
+            self.errors += 1
+            logger.exception("Cache write to Redis failed")
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        tags = list(tags)
+        await self.local.invalidate_tags(tags)
+        try:
+            pipe = self.client.pipeline()
+            for tag in tags:
+                pipe.smembers(self._tag_key(tag))
+            members = await pipe.execute()
+            keys = {member.decode() if isinstance(member, bytes) else member for keys in members for member in keys}
+            pipe = self.client.pipeline()
+            if keys:
+                pipe.delete(*(self._key(key) for key in keys))
+            if tags:
+                pipe.delete(*(self._tag_key(tag) for tag in tags))
+            pipe.publish(self.channel, json.dumps({"origin": self.origin, "tags": tags}))
+            await pipe.execute()
+        except Exception:
+            self.errors += 1
+            logger.exception("Cache invalidation in Redis failed")
+
+    async def clear(self) -> None:
+        await self.local.clear()
+        try:
+            keys = [key async for key in self.client.scan_iter(match=f"{self.namespace}:*", count=1000)]
+            pipe = self.client.pipeline()
+            if keys:
+                pipe.delete(*keys)
+            pipe.publish(self.channel, json.dumps({"origin": self.origin, "clear": True}))
+            await pipe.execute()
+        except Exception:
+            self.errors += 1
+            logger.exception("Cache clear in Redis failed")
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.local.stats()
+        stats.update({
+            "backend": "redis",
+            "remote_hits": self.remote_hits,
+            "remote_misses": self.remote_misses,
+            "errors": self.errors,
+        })
+        return stats
+
+    async def handle_message(self, message: Dict[str, Any]) -> None:
+        """Apply an invalidation published by another worker"""
+        payload = json.loads(message["data"])
+        if payload.get("origin") == self.origin:
+            return
+        if payload.get("clear"):
+            await self.local.clear()
+        else:
+            await self.local.invalidate_tags(payload.get("tags", []))
+
+    async def _listen(self, pubsub: Any) -> None:
+        try:
+            while True:
+                try:
+                    async for message in pubsub.listen():
+                        await self.handle_message(message)
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    self.errors += 1
+                    logger.exception("Cache invalidation listener failed")
+                    # Invalidations may have been missed while disconnected
+                    await self.local.clear()
+                    await asyncio.sleep(1.0)
+        finally:
+            await pubsub.aclose()
+
+    async def start(self) -> None:
+        if self._listener is not None:
+            return
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self.channel)
+        self._listener = asyncio.create_task(self._listen(pubsub))
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+
+def create_cache(namespace: str, max_entries: int, ttl_seconds: int) -> CacheBackend:
+    """
+    Create a cache using the backend selected by settings.CACHE_BACKEND.
+    """
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend(namespace, max_entries, ttl_seconds)
+    if settings.CACHE_BACKEND == "memory":
+        return MemoryCacheBackend(max_entries, ttl_seconds)
+    raise ValueError(f"Unknown CACHE_BACKEND: {settings.CACHE_BACKEND}")
+
+
+# Catalog read cache shared by the book endpoints
+catalog_cache = create_cache("catalog", settings.CATALOG_CACHE_MAX_ENTRIES, settings.CATALOG_CACHE_TTL_SECONDS)
+
+# Authenticated principal cache used by the auth dependencies
+principal_cache = create_cache(
+    "principal", settings.PRINCIPAL_CACHE_MAX_ENTRIES, settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+# Users who wrote recently and must read from the primary, not a replica
+# (one small entry per user, expiring after REPLICA_PIN_SECONDS)
+replica_pins = create_cache(
+    "replica_pin", settings.PRINCIPAL_CACHE_MAX_ENTRIES, settings.REPLICA_PIN_SECONDS
+)
+
+# Delayed invalidations waiting to run, cancelled on shutdown
+delayed_invalidations: Set[asyncio.Task] = set()
+
+
+def invalidate_tags_later(cache: CacheBackend, tags: Iterable[str], delay_seconds: float) -> None:
+    """
+    Invalidate tags again after delay_seconds, once read replicas have caught
+    up with a write: entries loaded from a lagging replica meanwhile may hold
+    the old rows.
+    """
+    tags = list(tags)
+    
+    async def invalidate():
+        await asyncio.sleep(delay_seconds)
+        await cache.invalidate_tags(tags)
+    
+    task = asyncio.create_task(invalidate())
+    delayed_invalidations.add(task)
+    task.add_done_callback(delayed_invalidations.discard)
+
+
+# Tag carried by every cached featured-books listing
+FEATURED_TAG = "featured"
+# Tag carried by every cached facet count (they depend on every book)
+FACETS_TAG = "facets"
+
+
+def book_tag(book_id: str) -> str:
+    """Tag carried by every cached entry that contains the book"""
+    return f"book:{book_id}"
+
+
+def category_tag(category: str) -> str:
+    """Tag carried by every cached listing of a category"""
+    return f"category:{category}"
+
+
+def user_tag(user_id: str) -> str:
+    """Tag carried by every cached entry derived from the user"""
+    return f"user:{user_id}"
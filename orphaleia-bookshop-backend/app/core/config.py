@@ -1,6 +1,6 @@
 import os
 import secrets
-from typing import List, Optional, Union, Any
+from typing import Any, Dict, List, Optional, Union
 
 from pydantic import AnyHttpUrl, EmailStr, field_validator
 from pydantic_settings import BaseSettings
@@ -12,6 +12,18 @@ class Settings(BaseSettings):
     SECRET_KEY: str = secrets.token_urlsafe(32)
     # 60 minutes * 24 hours * 8 days = 8 days
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    # Embed email/is_active/is_admin in access tokens so read-only endpoints can
+    # authenticate without a user lookup. Changes to those fields then only take
+    # effect on those endpoints once the user's token is renewed; writes and
+    # admin endpoints always check the user's current flags.
+    JWT_EMBED_CLAIMS: bool = False
+    
+    # Password hashing: bcrypt cost (existing hashes are upgraded on login when
+    # it changes) and the process pool that runs it
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    # Hashing requests allowed to wait or run at once before answering 503
+    PASSWORD_HASH_MAX_QUEUE: int = 32
     
     # CORS settings
     CORS_ORIGINS: Union[List[str], str] = []
@@ -40,6 +52,93 @@ class Settings(BaseSettings):
             return v
         return f"postgresql://{values.data.get('POSTGRES_USER')}:{values.data.get('POSTGRES_PASSWORD')}@{values.data.get('POSTGRES_SERVER')}/{values.data.get('POSTGRES_DB')}"
 
+    # URI for the async engine; derived from SQLALCHEMY_DATABASE_URI when unset
+    SQLALCHEMY_ASYNC_DATABASE_URI: Optional[str] = None
+
+    # Connection pool of each engine (per worker process). Pre-ping costs a
+    # round trip per checkout; with it disabled, DB_POOL_RECYCLE_SECONDS should
+    # be below the server's idle timeout.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Behind PgBouncer in transaction mode: don't rely on server-side prepared
+    # statements, which don't survive a change of server connection
+    DB_PGBOUNCER: bool = False
+
+    # Read replicas (comma-separated URIs) used by read-only endpoints. Users
+    # read from the primary for REPLICA_PIN_SECONDS after a write, and replicas
+    # failing their health check are skipped until they recover.
+    SQLALCHEMY_REPLICA_URIS: Union[List[str], str] = []
+    REPLICA_PIN_SECONDS: int = 5
+    REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: int = 10
+    REPLICA_HEALTH_CHECK_TIMEOUT_SECONDS: float = 2.0
+
+    @field_validator("SQLALCHEMY_REPLICA_URIS", mode="before")
+    def assemble_replica_uris(cls, v: Union[str, List[str]]) -> Union[List[str], str]:
+        if isinstance(v, str) and not v.startswith("["):
+            return [i.strip() for i in v.split(",") if i.strip()]
+        elif isinstance(v, (list, str)):
+            return v
+        raise ValueError(v)
+
+    # Cache backend settings: "memory" (per process) or "redis" (shared by all
+    # workers, with invalidations broadcast over pub/sub)
+    CACHE_BACKEND: str = "memory"
+    REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_INVALIDATION_CHANNEL: str = "orphaleia:cache:invalidate"
+
+    # Catalog read cache settings
+    CATALOG_CACHE_MAX_ENTRIES: int = 1024
+    CATALOG_CACHE_TTL_SECONDS: int = 300
+
+    # Cache-Control header per catalog route (route name -> header value)
+    HTTP_CACHE_CONTROL: Dict[str, str] = {
+        "read_books": "public, max-age=30",
+        "read_featured_books": "public, max-age=60",
+        "read_books_by_category": "public, max-age=60",
+        "read_book": "public, max-age=60",
+    }
+
+    # Authenticated principal cache settings
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+
+    # Idempotency-Key settings
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    IDEMPOTENCY_CLEANUP_INTERVAL_MINUTES: int = 60
+
+    # Admin catalog imports: uploads are streamed to a temporary file (in
+    # CATALOG_IMPORT_DIR, or the system default) and loaded in the background
+    # with one transaction per CATALOG_IMPORT_CHUNK_SIZE rows. At most
+    # CATALOG_IMPORT_MAX_ERRORS row errors are kept per job. Jobs whose worker
+    # has not reported progress for CATALOG_IMPORT_STALE_SECONDS (it crashed
+    # or restarted) are marked failed.
+    CATALOG_IMPORT_DIR: Optional[str] = None
+    CATALOG_IMPORT_MAX_BYTES: int = 512 * 1024 * 1024
+    CATALOG_IMPORT_CHUNK_SIZE: int = 1000
+    CATALOG_IMPORT_MAX_ERRORS: int = 1000
+    CATALOG_IMPORT_STALE_SECONDS: int = 600
+    # Rows fetched per round trip by catalog exports (server-side cursor)
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Title/author autocomplete index: built at startup, kept current by the
+    # book endpoints of this worker and rebuilt every interval to pick up
+    # changes made by other workers
+    SUGGEST_REFRESH_INTERVAL_SECONDS: int = 300
+
+    # Prometheus metrics at /metrics (set PROMETHEUS_MULTIPROC_DIR as well
+    # when running several workers)
+    METRICS_ENABLED: bool = True
+
+    # SQL statement budgets per request, declared with @query_budget: "off",
+    # "log" (development: log the statements of requests over budget) or
+    # "raise" (tests: fail the request). QUERY_BUDGET_DEFAULT applies to
+    # routes without a declared budget.
+    QUERY_BUDGET_MODE: str = "off"
+    QUERY_BUDGET_DEFAULT: Optional[int] = None
+
     # Email settings
     SMTP_TLS: bool = True
     SMTP_PORT: Optional[int] = None
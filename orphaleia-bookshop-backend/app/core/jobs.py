@@ -0,0 +1,186 @@
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Set
+
+from sqlalchemy import select
+from sqlalchemy.exc import DataError, IntegrityError
+from starlette.concurrency import run_in_threadpool
+
+from app import models
+from app.api import deps
+from app.core.cache import catalog_cache
+from app.core.config import settings
+from app.core.suggest import SuggestIndex, suggest_index
+from app.db.bulk import describe_error, parse_chunk, read_book_rows
+from app.db.crud import idempotency as crud_idempotency
+from app.db.crud import import_job as crud_import_job
+from app.db.session import AsyncSessionLocal, replica_router
+
+logger = logging.getLogger(__name__)
+
+
+async def run_periodically(
+    interval_seconds: float, job: Callable[[], Awaitable[None]], run_first: bool = False
+) -> None:
+    """
+    Run a job every interval_seconds, forever; with run_first, start right away.
+    """
+    delay = 0 if run_first else interval_seconds
+    while True:
+        await asyncio.sleep(delay)
+        delay = interval_seconds
+        try:
+            await job()
+        except Exception:
+            logger.exception("Periodic job %s failed", job.__name__)
+
+
+async def purge_idempotency_keys() -> None:
+    """
+    Delete expired Idempotency-Key records.
+    """
+    async with AsyncSessionLocal() as db:
+        removed = await crud_idempotency.delete_expired_keys(db)
+    if removed:
+        logger.info("Purged %d expired idempotency keys", removed)
+
+
+async def check_replicas() -> None:
+    """
+    Health-check the read replicas, taking failing ones out of rotation.
+    """
+    await replica_router.check_health()
+
+
+# One autocomplete rebuild at a time (periodic refresh, catalog imports)
+suggest_refresh_lock = asyncio.Lock()
+
+
+async def refresh_suggest_index() -> None:
+    """
+    Rebuild the autocomplete index from the book table. Books added, changed
+    or removed by this worker meanwhile are applied to the new index.
+    """
+    async with suggest_refresh_lock:
+        suggest_index.begin_rebuild()
+        try:
+            async with AsyncSessionLocal() as db:
+                rows = (await db.execute(
+                    select(models.Book.id, models.Book.title, models.Book.author)
+                )).all()
+            # Building is CPU-bound; keep it off the event loop
+            state = await run_in_threadpool(SuggestIndex.build, rows)
+        except BaseException:
+            suggest_index.abort_rebuild()
+            raise
+        suggest_index.finish_rebuild(state)
+
+
+async def expire_stale_imports() -> None:
+    """
+    Fail the import jobs left pending or running by a worker that stopped
+    (crash, restart) without recording their outcome.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.CATALOG_IMPORT_STALE_SECONDS)
+    async with AsyncSessionLocal() as db:
+        expired = await crud_import_job.fail_stale_import_jobs(
+            db, cutoff, "Interrupted: the worker running the import stopped"
+        )
+    if expired:
+        logger.warning("Failed %d stale catalog imports", expired)
+
+
+# Catalog imports running in this worker, cancelled on shutdown
+import_tasks: Set[asyncio.Task] = set()
+
+
+def start_catalog_import(job_id: str, path: str, file_format: str) -> None:
+    """
+    Run an import job in the background of this worker.
+    """
+    task = asyncio.create_task(import_catalog(job_id, path, file_format))
+    import_tasks.add(task)
+    task.add_done_callback(import_tasks.discard)
+
+
+async def import_catalog(job_id: str, path: str, file_format: str) -> None:
+    """
+    Upsert the books of an uploaded file chunk by chunk, recording progress and
+    row errors on the import job after each chunk. Deletes the file when done.
+    """
+    progress = {"rows_read": 0, "rows_inserted": 0, "rows_updated": 0, "rows_failed": 0}
+    errors = []
+    
+    def add_errors(new_errors):
+        progress["rows_failed"] += len(new_errors)
+        errors.extend(new_errors[:settings.CATALOG_IMPORT_MAX_ERRORS - len(errors)])
+    
+    try:
+        async with AsyncSessionLocal() as db:
+            started_at = datetime.utcnow()
+            await crud_import_job.update_import_job(
+                db, job_id, status="running", started_at=started_at, heartbeat_at=started_at
+            )
+            with open(path, newline="", encoding="utf-8-sig") as f:
+                rows = enumerate(read_book_rows(f, file_format), start=1)
+                while True:
+                    # Parsing and validation are CPU-bound; keep them off the event loop
+                    read, books, row_errors = await run_in_threadpool(
+                        parse_chunk, rows, settings.CATALOG_IMPORT_CHUNK_SIZE
+                    )
+                    if not read:
+                        break
+                    progress["rows_read"] += read
+                    add_errors(row_errors)
+                    try:
+                        inserted, updated = await crud_import_job.upsert_books(db, [book for _, book in books])
+                        await db.commit()
+                    except (IntegrityError, DataError):
+                        # Retry the chunk row by row to find the rows the database rejects
+                        await db.rollback()
+                        inserted = updated = 0
+                        for number, book in books:
+                            try:
+                                row_inserted, row_updated = await crud_import_job.upsert_books(db, [book])
+                                await db.commit()
+                                inserted += row_inserted
+                                updated += row_updated
+                            except (IntegrityError, DataError) as e:
+                                await db.rollback()
+                                add_errors([{"row": number, "isbn": book.isbn, "error": describe_error(e.orig)}])
+                    progress["rows_inserted"] += inserted
+                    progress["rows_updated"] += updated
+                    await crud_import_job.update_import_job(
+                        db, job_id, errors=json.dumps(errors), heartbeat_at=datetime.utcnow(), **progress
+                    )
+            
+            await crud_import_job.update_import_job(
+                db, job_id, status="completed", finished_at=datetime.utcnow()
+            )
+        logger.info("Catalog import %s completed: %s", job_id, progress)
+    except asyncio.CancelledError:
+        await fail_catalog_import(job_id, "Interrupted by shutdown")
+        raise
+    except Exception as e:
+        logger.exception("Catalog import %s failed", job_id)
+        await fail_catalog_import(job_id, describe_error(e))
+    finally:
+        os.remove(path)
+        if progress["rows_inserted"] or progress["rows_updated"]:
+            # Any cached listing may be stale; replicas may lag behind the load
+            await catalog_cache.clear()
+            await deps.pin_to_primary()
+            try:
+                await refresh_suggest_index()
+            except Exception:
+                logger.exception("Autocomplete refresh after catalog import %s failed", job_id)
+
+
+async def fail_catalog_import(job_id: str, error: str) -> None:
+    async with AsyncSessionLocal() as db:
+        await crud_import_job.update_import_job(
+            db, job_id, status="failed", finished_at=datetime.utcnow(), error=error
+        )
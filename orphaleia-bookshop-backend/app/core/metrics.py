@@ -0,0 +1,146 @@
+import os
+import time
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+import anyio.to_thread
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Gauge, Histogram, generate_latest, multiprocess
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.db.session import api_engines
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Requests are labelled with their route template, e.g. /api/v1/books/{book_id}
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS,
+)
+REQUEST_SIZE = Histogram(
+    "http_request_size_bytes", "HTTP request body size",
+    ["method", "route"], buckets=SIZE_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "HTTP response body size",
+    ["method", "route"], buckets=SIZE_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests being served", multiprocess_mode="livesum"
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements executed per HTTP request",
+    ["method", "route"], buckets=QUERY_COUNT_BUCKETS,
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "Time spent executing SQL statements per HTTP request",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+THREADPOOL_THREADS = Gauge(
+    "threadpool_threads", "Worker threads allowed for sync handlers and dependencies",
+    multiprocess_mode="livesum",
+)
+THREADPOOL_THREADS_IN_USE = Gauge(
+    "threadpool_threads_in_use", "Worker threads running sync handlers and dependencies",
+    multiprocess_mode="livesum",
+)
+THREADPOOL_TASKS_WAITING = Gauge(
+    "threadpool_tasks_waiting", "Sync handlers and dependencies waiting for a worker thread",
+    multiprocess_mode="livesum",
+)
+
+
+class RequestDbStats:
+    """SQL statements executed while serving one request"""
+
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+# Set by the metrics middleware for the duration of each request
+request_db_stats: ContextVar[Optional[RequestDbStats]] = ContextVar("request_db_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None and request_db_stats.get() is not None:
+        context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = request_db_stats.get()
+    start = getattr(context, "_metrics_start", None)
+    if stats is not None and start is not None:
+        stats.queries += 1
+        stats.seconds += time.perf_counter() - start
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Count the SQL statements executed by an engine (sync engine of an async
+    engine) and their duration towards the current request.
+    """
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def instrument_engines() -> None:
+    for _, engine in api_engines():
+        instrument_engine(engine.sync_engine)
+
+
+class PoolCollector:
+    """
+    Exposes the connection pool gauges and checkout times of this worker.
+    """
+
+    def collect(self) -> Iterator[Any]:
+        size = GaugeMetricFamily("db_pool_size", "Connections kept in the pool", labels=["engine"])
+        checked_out = GaugeMetricFamily("db_pool_checked_out", "Connections in use", labels=["engine"])
+        overflow = GaugeMetricFamily("db_pool_overflow", "Connections open beyond the pool size", labels=["engine"])
+        timeouts = CounterMetricFamily("db_pool_timeouts", "Checkouts that timed out", labels=["engine"])
+        checkout = HistogramMetricFamily(
+            "db_pool_checkout_seconds", "Time to check a connection out of the pool", labels=["engine"]
+        )
+        for name, engine in api_engines():
+            stats = engine.pool.stats()
+            size.add_metric([name], stats["size"])
+            checked_out.add_metric([name], stats["checked_out"])
+            overflow.add_metric([name], stats["overflow"])
+            timeouts.add_metric([name], stats["timeouts"])
+            histogram = stats["checkout_seconds"]
+            checkout.add_metric([name], list(histogram["buckets"].items()), histogram["sum"])
+        yield from (size, checked_out, overflow, timeouts, checkout)
+
+
+def _update_threadpool_gauges() -> None:
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    statistics = limiter.statistics()
+    THREADPOOL_THREADS.set(limiter.total_tokens)
+    THREADPOOL_THREADS_IN_USE.set(statistics.borrowed_tokens)
+    THREADPOOL_TASKS_WAITING.set(statistics.tasks_waiting)
+
+
+def render_metrics() -> bytes:
+    """
+    Render all metrics in the Prometheus text format. Must be called from the
+    event loop, which owns the threadpool limiter.
+    
+    With PROMETHEUS_MULTIPROC_DIR set (several workers), the metrics of all
+    workers are aggregated; pool gauges are then per worker and left out.
+    """
+    _update_threadpool_gauges()
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+REGISTRY.register(PoolCollector())
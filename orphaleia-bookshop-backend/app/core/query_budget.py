@@ -0,0 +1,137 @@
+import logging
+import os
+import re
+import sys
+from collections import Counter
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, TypeVar
+
+from greenlet import getcurrent
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.db.session import api_engines
+
+logger = logging.getLogger(__name__)
+
+# Call sites are reported from the application code, not from libraries
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+F = TypeVar("F", bound=Callable)
+
+_PLACEHOLDER = r"(?:\?|%\(\w+\)s|%s|\$\d+|:\w+)(?:::\w+)?"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|(?<![$\w])\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request executed more SQL statements than its route allows"""
+
+
+def query_budget(max_queries: int) -> Callable[[F], F]:
+    """
+    Declare how many SQL statements one request to the decorated endpoint may
+    execute, dependencies included. Put it below the route decorator.
+    """
+    def decorate(endpoint: F) -> F:
+        endpoint.query_budget = max_queries
+        return endpoint
+    return decorate
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Normalize a statement so executions differing only in parameters (or in
+    the length of an IN list) share a fingerprint.
+    """
+    statement = _PLACEHOLDER_LIST.sub("(?)", statement)
+    statement = _PLACEHOLDER_LIST.sub("(?)", _LITERAL.sub("?", statement))
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+def _frames() -> Iterator:
+    # Async sessions run statements in a greenlet; its parents hold the frames
+    # of the coroutines that awaited them
+    frame = sys._getframe(1)
+    current = getcurrent()
+    while True:
+        while frame is not None:
+            yield frame
+            frame = frame.f_back
+        current = current.parent
+        if current is None:
+            return
+        frame = current.gr_frame
+
+
+def call_site() -> str:
+    """Innermost application frame outside this module, as path:line in function"""
+    for frame in _frames():
+        filename = frame.f_code.co_filename
+        if filename.startswith(APP_DIR) and filename != __file__:
+            return f"{os.path.relpath(filename, os.path.dirname(APP_DIR))}:{frame.f_lineno} in {frame.f_code.co_name}"
+    return "unknown"
+
+
+class QueryLog:
+    """SQL statements executed while serving one request"""
+
+    def __init__(self):
+        self.fingerprints: Counter = Counter()
+        self.call_sites: Dict[str, Counter] = {}
+
+    @property
+    def count(self) -> int:
+        return sum(self.fingerprints.values())
+
+    def record(self, statement: str) -> None:
+        key = fingerprint(statement)
+        self.fingerprints[key] += 1
+        self.call_sites.setdefault(key, Counter())[call_site()] += 1
+
+    def report(self) -> List[str]:
+        """Statements by number of executions, repeated ones first"""
+        lines = []
+        for key, count in self.fingerprints.most_common():
+            sites = ", ".join(f"{site} (x{n})" for site, n in self.call_sites[key].most_common())
+            lines.append(f"{count}x {key}\n    from {sites}")
+        return lines
+
+
+# Set by the query budget middleware for the duration of each request
+request_query_log: ContextVar[Optional[QueryLog]] = ContextVar("request_query_log", default=None)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    log = request_query_log.get()
+    if log is not None:
+        log.record(statement)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Record the statements executed by an engine towards the current request"""
+    if not event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def instrument_engines() -> None:
+    for _, engine in api_engines():
+        instrument_engine(engine.sync_engine)
+
+
+def check_budget(route: str, budget: Optional[int], log: QueryLog) -> None:
+    """
+    Log (QUERY_BUDGET_MODE=log) or raise QueryBudgetExceeded
+    (QUERY_BUDGET_MODE=raise) when the request went over its budget.
+    """
+    if budget is None or log.count <= budget:
+        return
+    message = (
+        f"{route} executed {log.count} SQL statements, budget is {budget}:\n"
+        + "\n".join(log.report())
+    )
+    if settings.QUERY_BUDGET_MODE == "raise":
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
@@ -1,17 +1,26 @@
+import asyncio
+import multiprocessing
 import uuid
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Dict, Optional, Tuple, Union
 
+from fastapi import HTTPException
 from jose import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+# Process pool for bcrypt work, created on first use
+_password_pool: Optional[ProcessPoolExecutor] = None
+# Hashing jobs submitted to the pool and not finished yet
+_password_jobs_in_flight = 0
 
 
 def create_access_token(
-    subject: Union[str, Any], expires_delta: timedelta = None
+    subject: Union[str, Any], expires_delta: timedelta = None, claims: Optional[Dict[str, Any]] = None
 ) -> str:
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -19,7 +28,7 @@ def create_access_token(
         expire = datetime.utcnow() + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {**(claims or {}), "exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
     return encoded_jwt
 
@@ -32,5 +41,67 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and return a new hash if the stored one uses an outdated
+    scheme or bcrypt cost.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def _get_password_pool() -> ProcessPoolExecutor:
+    global _password_pool
+    if _password_pool is None:
+        # spawn: forking a process that runs the event loop and its threads is unsafe
+        _password_pool = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _password_pool
+
+
+async def _run_in_password_pool(func, *args):
+    """
+    Run bcrypt work in the password process pool, rejecting new work with 503
+    once PASSWORD_HASH_MAX_QUEUE jobs are waiting or running.
+    """
+    global _password_jobs_in_flight
+    if _password_jobs_in_flight >= settings.PASSWORD_HASH_MAX_QUEUE:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many authentication requests, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    _password_jobs_in_flight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_password_pool(), func, *args)
+    finally:
+        _password_jobs_in_flight -= 1
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    verify_and_update_password() without blocking the event loop or the threadpool.
+    """
+    return await _run_in_password_pool(verify_and_update_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    get_password_hash() without blocking the event loop or the threadpool.
+    """
+    return await _run_in_password_pool(get_password_hash, password)
+
+
+def shutdown_password_pool() -> None:
+    global _password_pool
+    if _password_pool is not None:
+        _password_pool.shutdown(wait=False, cancel_futures=True)
+        _password_pool = None
+
+
 def generate_uuid() -> str:
-    return str(uuid.uuid4())
\ No newline at end of file
+    return str(uuid.uuid4())
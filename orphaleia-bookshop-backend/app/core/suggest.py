@@ -0,0 +1,256 @@
+import re
+import unicodedata
+from bisect import bisect_left, insort
+import heapq
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# A suggestion is a book title or an author name: (kind, text)
+Key = Tuple[str, str]
+
+# Prefix matches examined per query, taken in word order
+MAX_PREFIX_CANDIDATES = 500
+# Postings read for typo-tolerant matching, rarest trigrams first
+MAX_TRIGRAM_POSTINGS = 2000
+# Fuzzy candidates scored exactly, most shared trigrams first
+MAX_FUZZY_CANDIDATES = 100
+# Minimum trigram similarity of a fuzzy match (as pg_trgm's default)
+MIN_SIMILARITY = 0.3
+
+
+def normalize(text: str) -> str:
+    """Lowercase and strip accents, so "Éire" matches "eire" """
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(normalize(text))
+
+
+@lru_cache(maxsize=65536)
+def trigrams(word: str) -> FrozenSet[str]:
+    """Trigrams of a word padded like pg_trgm: "  w", " wo", "wor", ..., "rd " """
+    padded = f"  {word} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def similarity(query_grams: FrozenSet[str], word: str) -> float:
+    word_grams = trigrams(word)
+    shared = len(query_grams & word_grams)
+    return shared / (len(query_grams) + len(word_grams) - shared)
+
+
+def _discard_sorted(items: List[Tuple[str, Key]], item: Tuple[str, Key]) -> None:
+    index = bisect_left(items, item)
+    if index < len(items) and items[index] == item:
+        del items[index]
+
+
+class _State:
+    """The index structures, swapped as a whole on rebuild"""
+
+    def __init__(self):
+        # book id -> (title, author)
+        self.books: Dict[str, Tuple[str, str]] = {}
+        # suggestion -> ids of the books it comes from
+        self.entries: Dict[Key, Set[str]] = {}
+        # suggestion -> its distinct words, and its normalized text
+        self.words: Dict[Key, Tuple[str, ...]] = {}
+        self.texts: Dict[Key, str] = {}
+        # (text, suggestion) and (word, suggestion) pairs in sorted order, for prefix lookups
+        self.sorted_texts: List[Tuple[str, Key]] = []
+        self.sorted_words: List[Tuple[str, Key]] = []
+        # word trigram -> suggestions containing it (numbers are left out)
+        self.postings: Dict[str, Set[Key]] = {}
+        # While building, pairs are appended and sorted once at the end
+        self.building = False
+
+    def add_book(self, book_id: str, title: str, author: str) -> None:
+        self.remove_book(book_id)
+        self.books[book_id] = (title, author)
+        for key in (("title", title), ("author", author)):
+            ids = self.entries.get(key)
+            if ids is None:
+                ids = self.entries[key] = set()
+                self._add_entry(key)
+            ids.add(book_id)
+
+    def remove_book(self, book_id: str) -> None:
+        book = self.books.pop(book_id, None)
+        if book is None:
+            return
+        title, author = book
+        for key in (("title", title), ("author", author)):
+            ids = self.entries.get(key)
+            if ids is None:
+                continue
+            ids.discard(book_id)
+            if not ids:
+                del self.entries[key]
+                self._remove_entry(key)
+
+    def _add_entry(self, key: Key) -> None:
+        tokens = tokenize(key[1])
+        words = tuple(dict.fromkeys(tokens))
+        self.words[key] = words
+        text = self.texts[key] = " ".join(tokens)
+        add = list.append if self.building else insort
+        add(self.sorted_texts, (text, key))
+        for word in words:
+            add(self.sorted_words, (word, key))
+            if not word.isdigit():
+                for gram in trigrams(word):
+                    self.postings.setdefault(gram, set()).add(key)
+
+    def _remove_entry(self, key: Key) -> None:
+        _discard_sorted(self.sorted_texts, (self.texts.pop(key), key))
+        for word in self.words.pop(key, ()):
+            _discard_sorted(self.sorted_words, (word, key))
+            if word.isdigit():
+                continue
+            for gram in trigrams(word):
+                keys = self.postings.get(gram)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self.postings[gram]
+
+
+class SuggestIndex:
+    """
+    In-memory autocomplete over book titles and author names.
+
+    Suggestions whose words start with every word of the query rank first
+    (whole-text prefix matches before word-prefix matches, shorter first).
+    Remaining slots are filled with typo-tolerant matches: each query word
+    is compared with the words of a suggestion by trigram similarity.
+
+    The index is built from the book table (rebuild), kept current by the
+    book endpoints (add_book/remove_book) and periodically rebuilt to pick
+    up changes made by other workers. Queries never touch the database.
+    """
+
+    def __init__(self):
+        self._state = _State()
+        self.ready = False
+        # Changes made while a rebuild loads the books, replayed on the new state
+        self._journal: Optional[List[Tuple[str, Tuple[Any, ...]]]] = None
+
+    def add_book(self, book_id: str, title: str, author: str) -> None:
+        """Index a new book, or re-index a changed one"""
+        self._state.add_book(book_id, title, author)
+        if self._journal is not None:
+            self._journal.append(("add_book", (book_id, title, author)))
+
+    def remove_book(self, book_id: str) -> None:
+        self._state.remove_book(book_id)
+        if self._journal is not None:
+            self._journal.append(("remove_book", (book_id,)))
+
+    def begin_rebuild(self) -> None:
+        """Start recording changes; call before loading the books"""
+        self._journal = []
+
+    def abort_rebuild(self) -> None:
+        """Stop recording changes after a failed rebuild"""
+        self._journal = None
+
+    @staticmethod
+    def build(books: Iterable[Tuple[str, str, str]]) -> _State:
+        """Build new index structures from (id, title, author) rows"""
+        state = _State()
+        state.building = True
+        for book_id, title, author in books:
+            state.add_book(book_id, title, author)
+        state.sorted_texts.sort()
+        state.sorted_words.sort()
+        state.building = False
+        return state
+
+    def finish_rebuild(self, state: _State) -> None:
+        """Swap in a state from build() and replay the changes recorded since begin_rebuild()"""
+        for method, args in self._journal or ():
+            getattr(state, method)(*args)
+        self._state = state
+        self._journal = None
+        self.ready = True
+
+    def suggest(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        state = self._state
+        query_words = tokenize(query)
+        if not query_words:
+            return []
+        normalized_query = " ".join(query_words)
+
+        ranked: Dict[Key, Tuple] = {}
+        # Suggestions starting with the query
+        start = bisect_left(state.sorted_texts, (normalized_query,))
+        for text, key in state.sorted_texts[start:start + MAX_PREFIX_CANDIDATES]:
+            if not text.startswith(normalized_query):
+                break
+            ranked[key] = (0, 0, len(key[1]), key[1])
+
+        # Suggestions with a word starting with each query word; scan the
+        # range of the longest, most selective one
+        pivot = max(query_words, key=len)
+        others = [word for word in query_words if word != pivot]
+        start = bisect_left(state.sorted_words, (pivot,))
+        for word, key in state.sorted_words[start:start + MAX_PREFIX_CANDIDATES]:
+            if not word.startswith(pivot):
+                break
+            if key in ranked:
+                continue
+            if others and not all(any(w.startswith(q) for w in state.words[key]) for q in others):
+                continue
+            ranked[key] = (0, 1, len(key[1]), key[1])
+
+        if len(ranked) < limit:
+            for key, score in self._fuzzy(state, query_words).items():
+                ranked.setdefault(key, (1, -score, len(key[1]), key[1]))
+
+        best = heapq.nsmallest(limit, ranked, key=ranked.__getitem__)
+        return [{"text": key[1], "kind": key[0], "book_id": self._book_id(state, key)} for key in best]
+
+    @staticmethod
+    def _book_id(state: _State, key: Key) -> Optional[str]:
+        """The book a title suggestion links to; titles shared by several books link to none"""
+        ids = state.entries[key]
+        if key[0] != "title" or len(ids) != 1:
+            return None
+        return next(iter(ids))
+
+    @staticmethod
+    def _fuzzy(state: _State, query_words: List[str]) -> Dict[Key, float]:
+        """Suggestions similar to the query words, with their mean best-word similarity"""
+        query_grams = [trigrams(word) for word in query_words]
+        postings = sorted(
+            (state.postings[gram] for grams in query_grams for gram in grams if gram in state.postings),
+            key=len,
+        )
+        shared: Counter = Counter()
+        read = 0
+        for keys in postings:
+            # Trigrams this common say little about the match
+            if read + len(keys) > MAX_TRIGRAM_POSTINGS:
+                break
+            shared.update(keys)
+            read += len(keys)
+
+        scores = {}
+        for key, _ in shared.most_common(MAX_FUZZY_CANDIDATES):
+            words = state.words[key]
+            score = sum(
+                max(similarity(grams, word) for word in words) for grams in query_grams
+            ) / len(query_grams)
+            if score >= MIN_SIMILARITY:
+                scores[key] = score
+        return scores
+
+
+suggest_index = SuggestIndex()
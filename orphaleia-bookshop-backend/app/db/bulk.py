@@ -0,0 +1,296 @@
+"""
+Streaming bulk load of books from JSONL or CSV files.
+
+Rows are validated with schemas.BookCreate and inserted in batches of
+INSERT ... ON CONFLICT (isbn) DO NOTHING, so loading the same file twice
+is harmless. On PostgreSQL the chunks can go through COPY instead. A chunk
+the database rejects (e.g. an id already taken by another book) is retried
+row by row, and the rejected rows are reported.
+"""
+import csv
+import io
+import json
+import logging
+import time
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from pydantic import ValidationError
+from sqlalchemy import insert, text
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.security import generate_uuid
+from app.models.book import Book
+from app.schemas.book import BookCreate
+
+logger = logging.getLogger(__name__)
+
+# Columns written by the loader, in COPY order
+BOOK_COLUMNS = [
+    "id", "title", "author", "description", "cover", "price", "category",
+    "publication_date", "publisher", "isbn", "pages", "format", "featured",
+    "stock", "created_at", "updated_at",
+]
+# Columns an upsert may overwrite, and those only overwritten when present in the row
+UPSERT_COLUMNS = [column for column in BOOK_COLUMNS if column not in ("id", "created_at")]
+OPTIONAL_COLUMNS = ("featured", "stock")
+# Alternative field names accepted in input files (app/data/sample_books.py style)
+FIELD_ALIASES = {"publicationDate": "publication_date"}
+# Invalid rows logged in full before only counting them
+MAX_LOGGED_ERRORS = 10
+
+
+class LoadStats:
+    """Progress of a bulk load"""
+
+    def __init__(self):
+        self.read = 0
+        self.inserted = 0
+        self.invalid = 0
+        self.failed = 0
+        self.started = time.perf_counter()
+
+    @property
+    def skipped(self) -> int:
+        """Valid rows not inserted because their isbn already exists"""
+        return self.read - self.invalid - self.failed - self.inserted
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        return self.read / elapsed if elapsed else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.read} rows read, {self.inserted} inserted, {self.skipped} already present, "
+            f"{self.invalid} invalid, {self.failed} rejected by the database "
+            f"({self.rows_per_second:.0f} rows/s)"
+        )
+
+
+def detect_format(path: str) -> str:
+    if path.endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    if path.endswith(".csv"):
+        return "csv"
+    raise ValueError(f"Cannot tell the format of {path}, expected .jsonl or .csv")
+
+
+def read_book_rows(lines: Iterable[str], file_format: str) -> Iterator[Union[str, Dict[str, Any]]]:
+    """
+    Split a JSONL or CSV (with header) file into one record per book: the JSON
+    text of JSONL lines, decoded by parse_book, or a dict per CSV row.
+    """
+    if file_format == "jsonl":
+        for line in lines:
+            if line.strip():
+                yield line
+    elif file_format == "csv":
+        for row in csv.DictReader(lines):
+            # Empty CSV cells stand for missing values
+            yield {key: value for key, value in row.items() if value != ""}
+    else:
+        raise ValueError(f"Unsupported format: {file_format}")
+
+
+def parse_book(row: Union[str, Dict[str, Any]], default_stock: Optional[int] = None) -> BookCreate:
+    """
+    Validate a record from read_book_rows. Raises ValueError for invalid rows.
+    """
+    if isinstance(row, str):
+        row = json.loads(row)
+    if not isinstance(row, dict):
+        raise ValueError("Expected a JSON object")
+    row = {FIELD_ALIASES.get(key, key): value for key, value in row.items()}
+    if default_stock is not None:
+        row.setdefault("stock", default_stock)
+    return BookCreate.model_validate(row)
+
+
+def describe_error(error: Exception) -> str:
+    """Short description of why a row is invalid"""
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in e['loc']) or 'row'}: {e['msg']}" for e in error.errors()
+        )
+    return str(error)
+
+
+def book_values(book: BookCreate, now: datetime) -> Dict[str, Any]:
+    """
+    Book column values to insert for a validated row.
+    """
+    values = book.model_dump()
+    values["id"] = values["id"] or generate_uuid()
+    values["featured"] = bool(values["featured"])
+    values["created_at"] = now
+    values["updated_at"] = now
+    return values
+
+
+def updated_columns(book: BookCreate) -> Tuple[str, ...]:
+    """
+    Columns an upsert overwrites on an existing book with the same isbn. The id
+    and created_at are kept, as are featured and stock when the row omits them.
+    """
+    return tuple(
+        column for column in UPSERT_COLUMNS
+        if column not in OPTIONAL_COLUMNS or column in book.model_fields_set
+    )
+
+
+def upsert_statement(dialect: str, update: Optional[Sequence[str]] = None):
+    """
+    INSERT of books that skips existing isbns, or updates the given columns of
+    them. Executed with a list of book_values.
+    """
+    if dialect == "postgresql":
+        statement = postgresql_insert(Book.__table__)
+    elif dialect == "sqlite":
+        statement = sqlite_insert(Book.__table__)
+    elif update:
+        raise ValueError(f"Upserting books is not supported on {dialect}")
+    else:
+        return insert(Book.__table__).prefix_with("IGNORE")
+    if update:
+        return statement.on_conflict_do_update(
+            index_elements=["isbn"], set_={column: statement.excluded[column] for column in update}
+        )
+    return statement.on_conflict_do_nothing(index_elements=["isbn"])
+
+
+def insert_books(conn: Connection, values: List[Dict[str, Any]]) -> int:
+    """
+    Insert books, skipping those whose isbn already exists. Returns the number
+    of rows inserted.
+    """
+    if not values:
+        return 0
+    statement = upsert_statement(conn.dialect.name)
+    if conn.dialect.name not in ("postgresql", "sqlite"):
+        return conn.execute(statement, values).rowcount
+    # Executed as batched multi-row INSERTs ("insertmanyvalues"); the statement
+    # is compiled once and the returned ids count only the rows really inserted
+    return len(conn.execute(statement.returning(Book.id), values).all())
+
+
+def copy_books(conn: Connection, values: List[Dict[str, Any]]) -> int:
+    """
+    Insert books through COPY into a temporary table (PostgreSQL with
+    psycopg2), skipping those whose isbn already exists.
+    """
+    if not values:
+        return 0
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in values:
+        writer.writerow([
+            row[column].isoformat() if isinstance(row[column], datetime) else row[column]
+            for column in BOOK_COLUMNS
+        ])
+    buffer.seek(0)
+    
+    columns = ", ".join(BOOK_COLUMNS)
+    conn.execute(text("CREATE TEMPORARY TABLE IF NOT EXISTS book_load (LIKE book INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"))
+    cursor = conn.connection.cursor()
+    if not hasattr(cursor, "copy_expert"):
+        raise RuntimeError("COPY loading needs the psycopg2 driver")
+    cursor.copy_expert(f"COPY book_load ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+    result = conn.execute(text(
+        f"INSERT INTO book ({columns}) SELECT {columns} FROM book_load ON CONFLICT (isbn) DO NOTHING"
+    ))
+    return result.rowcount
+
+
+def _chunks(rows: Iterator[Any], size: int) -> Iterator[List[Any]]:
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def load_books(
+    engine: Engine,
+    rows: Iterator[Union[str, Dict[str, Any]]],
+    chunk_size: int = 1000,
+    use_copy: bool = False,
+    default_stock: Optional[int] = None,
+) -> LoadStats:
+    """
+    Validate and insert books chunk by chunk, committing and logging progress
+    after each chunk.
+    """
+    if use_copy and engine.dialect.name != "postgresql":
+        raise ValueError("COPY loading is only available on PostgreSQL")
+    stats = LoadStats()
+    now = datetime.utcnow()
+    
+    for chunk in _chunks(rows, chunk_size):
+        numbered = []
+        for row in chunk:
+            stats.read += 1
+            try:
+                numbered.append((stats.read, book_values(parse_book(row, default_stock), now)))
+            except (ValueError, TypeError) as e:
+                stats.invalid += 1
+                if stats.invalid <= MAX_LOGGED_ERRORS:
+                    logger.warning("Skipping invalid book on row %d: %s", stats.read, describe_error(e))
+        values = [row_values for _, row_values in numbered]
+        try:
+            with engine.begin() as conn:
+                stats.inserted += copy_books(conn, values) if use_copy else insert_books(conn, values)
+        except (IntegrityError, DataError):
+            # Retry the chunk row by row to find the rows the database rejects
+            for number, row_values in numbered:
+                try:
+                    with engine.begin() as conn:
+                        stats.inserted += insert_books(conn, [row_values])
+                except (IntegrityError, DataError) as e:
+                    stats.failed += 1
+                    if stats.failed <= MAX_LOGGED_ERRORS:
+                        logger.warning(
+                            "Skipping book on row %d (isbn %s): %s", number, row_values["isbn"], describe_error(e.orig)
+                        )
+        logger.info("Loading books: %s", stats)
+    return stats
+
+
+def load_books_file(
+    engine: Engine,
+    path: str,
+    file_format: Optional[str] = None,
+    chunk_size: int = 1000,
+    use_copy: bool = False,
+) -> LoadStats:
+    """
+    Stream a JSONL or CSV file of books into the database.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return load_books(
+            engine, read_book_rows(f, file_format or detect_format(path)), chunk_size, use_copy
+        )
+
+
+def parse_chunk(
+    rows: Iterator[Tuple[int, Union[str, Dict[str, Any]]]], size: int
+) -> Tuple[int, List[Tuple[int, BookCreate]], List[Dict[str, Any]]]:
+    """
+    Validate the next size (row number, record) pairs. Returns the number of
+    rows read, the valid books with their row numbers and the errors of the
+    invalid rows.
+    """
+    books, errors = [], []
+    read = 0
+    for number, row in islice(rows, size):
+        read += 1
+        try:
+            books.append((number, parse_book(row)))
+        except (ValueError, TypeError) as e:
+            isbn = row.get("isbn") if isinstance(row, dict) else None
+            errors.append({"row": number, "isbn": isbn, "error": describe_error(e)})
+    return read, books, errors
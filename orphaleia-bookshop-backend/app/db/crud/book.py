@@ -0,0 +1,55 @@
+from typing import Dict, Iterable, List
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import schemas
+from app.core.cache import book_tag, cache_key, catalog_cache
+from app.models.book import Book
+
+
+def book_cache_key(book_id: str) -> str:
+    """Catalog cache key of a single book (shared by GET /books/{id} and batch lookups)"""
+    return cache_key("book", id=book_id)
+
+
+def serialize_books(books: Iterable[Book]) -> List[dict]:
+    """
+    Serialize books to JSON-compatible dicts for the catalog cache.
+    """
+    return [schemas.Book.model_validate(book).model_dump(mode="json") for book in books]
+
+
+async def get_books_by_ids(db: AsyncSession, book_ids: Iterable[str], for_update: bool = False) -> Dict[str, Book]:
+    """
+    Load books by id in a single IN query; missing ids are absent from the
+    result. With for_update the rows are locked in id order, which keeps
+    transactions locking overlapping sets of books from deadlocking.
+    """
+    book_ids = sorted(set(book_ids))
+    if not book_ids:
+        return {}
+    query = select(Book).where(Book.id.in_(book_ids))
+    if for_update:
+        query = query.order_by(Book.id).with_for_update()
+    result = await db.execute(query)
+    return {book.id: book for book in result.scalars()}
+
+
+async def get_cached_books(db: AsyncSession, book_ids: Iterable[str]) -> Dict[str, dict]:
+    """
+    Serialized books by id, read through the catalog cache; the books not in
+    the cache are loaded with a single query. Missing ids are absent from the
+    result.
+    """
+    ids_by_key = {book_cache_key(book_id): book_id for book_id in book_ids}
+    
+    async def load(keys: List[str]):
+        books = await get_books_by_ids(db, (ids_by_key[key] for key in keys))
+        return {
+            book_cache_key(book.id): (value, [book_tag(book.id)])
+            for book, value in zip(books.values(), serialize_books(books.values()))
+        }
+    
+    values = await catalog_cache.get_or_load_many(ids_by_key, load)
+    return {ids_by_key[key]: value for key, value in values.items()}
@@ -0,0 +1,61 @@
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.idempotency_key import IdempotencyKey
+
+# Response header marking a replayed response
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def hash_request(request_in: BaseModel) -> str:
+    """Hash a request body so a reused key can be matched to its original request"""
+    payload = json.dumps(request_in.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def expiry_cutoff() -> datetime:
+    """Creation time before which idempotency keys are expired"""
+    return datetime.utcnow() - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+
+
+async def get_idempotency_key(db: AsyncSession, user_id: str, key: str) -> Optional[IdempotencyKey]:
+    """Get an unexpired idempotency key for a user"""
+    result = await db.execute(select(IdempotencyKey).where(
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.key == key,
+        IdempotencyKey.created_at >= expiry_cutoff()
+    ))
+    return result.scalars().first()
+
+
+def replay_response(stored: IdempotencyKey, request_hash: str) -> Response:
+    """Return the stored response of a completed request"""
+    if stored.request_hash != request_hash:
+        raise HTTPException(
+            status_code=422,
+            detail="Idempotency-Key has already been used with a different request"
+        )
+    return Response(
+        content=stored.response_body,
+        media_type="application/json",
+        headers={REPLAYED_HEADER: "true"},
+    )
+
+
+async def delete_expired_keys(db: AsyncSession) -> int:
+    """Remove idempotency keys older than IDEMPOTENCY_KEY_TTL_HOURS"""
+    result = await db.execute(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.created_at < expiry_cutoff()
+        ).execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount
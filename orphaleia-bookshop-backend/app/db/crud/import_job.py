@@ -0,0 +1,83 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import generate_uuid
+from app.db.bulk import book_values, updated_columns, upsert_statement
+from app.models.book import Book
+from app.models.import_job import ImportJob
+from app.schemas.book import BookCreate
+
+
+async def create_import_job(db: AsyncSession, user_id: str, file_format: str) -> ImportJob:
+    """Create a pending import job"""
+    job = ImportJob(
+        id=generate_uuid(),
+        user_id=user_id,
+        format=file_format,
+        status="pending",
+        rows_read=0,
+        rows_inserted=0,
+        rows_updated=0,
+        rows_failed=0,
+        errors="[]",
+    )
+    db.add(job)
+    await db.commit()
+    return job
+
+
+async def get_import_job(db: AsyncSession, job_id: str) -> Optional[ImportJob]:
+    """Get an import job by ID"""
+    return await db.get(ImportJob, job_id)
+
+
+async def update_import_job(db: AsyncSession, job_id: str, **values: Any) -> None:
+    """Record the progress or outcome of an import job"""
+    await db.execute(update(ImportJob).where(ImportJob.id == job_id).values(**values))
+    await db.commit()
+
+
+async def fail_stale_import_jobs(db: AsyncSession, cutoff: datetime, error: str) -> int:
+    """
+    Fail the pending or running jobs whose worker has not reported since
+    cutoff. Returns the number of jobs failed.
+    """
+    result = await db.execute(
+        update(ImportJob)
+        .where(
+            ImportJob.status.in_(("pending", "running")),
+            func.coalesce(ImportJob.heartbeat_at, ImportJob.created_at) < cutoff,
+        )
+        .values(status="failed", error=error, finished_at=datetime.utcnow())
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def upsert_books(db: AsyncSession, books: List[BookCreate]) -> Tuple[int, int]:
+    """
+    Insert books, or update the existing books with the same isbn, without
+    committing. Later rows win over earlier ones with the same isbn. Returns
+    the numbers of rows inserted and updated.
+    """
+    latest = {book.isbn: book for book in books}
+    existing = set((await db.execute(
+        select(Book.isbn).where(Book.isbn.in_(list(latest)))
+    )).scalars())
+    
+    # Rows omitting featured/stock keep the stored values, so they need their
+    # own statement
+    now = datetime.utcnow()
+    groups = defaultdict(list)
+    for book in latest.values():
+        groups[updated_columns(book)].append(book_values(book, now))
+    dialect = db.get_bind().dialect.name
+    for columns, values in groups.items():
+        await db.execute(upsert_statement(dialect, columns), values)
+    
+    inserted = len(latest) - len(existing)
+    return inserted, len(books) - inserted
@@ -0,0 +1,132 @@
+from typing import Dict, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import case, delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import schemas
+from app.core.cache import book_tag, catalog_cache, invalidate_tags_later
+from app.core.config import settings
+from app.core.security import generate_uuid
+from app.db.crud.book import get_books_by_ids
+from app.db.crud.idempotency import expiry_cutoff, hash_request
+from app.db.session import replica_router
+from app.models.book import Book
+from app.models.idempotency_key import IdempotencyKey
+from app.models.order import Order, OrderItem
+from app.schemas.order import OrderCreate
+
+
+async def create_order(
+    db: AsyncSession, user_id: str, order_in: OrderCreate, idempotency_key: Optional[str] = None
+) -> Order:
+    """
+    Place an order: reserve stock for every cart line and write the order with
+    its items in a single transaction.
+    
+    With an idempotency key, the serialized order is stored under that key in
+    the same transaction so retries can be answered without a new checkout.
+    """
+    # Merge duplicate cart lines, keeping cart order for the order items
+    quantities: Dict[str, int] = {}
+    for item in order_in.items:
+        if item.quantity < 1:
+            raise HTTPException(status_code=400, detail="Item quantity must be at least 1")
+        quantities[item.book_id] = quantities.get(item.book_id, 0) + item.quantity
+    if not quantities:
+        raise HTTPException(status_code=400, detail="Order must contain at least one item")
+    
+    # Load and lock all books in one query; locking in id order keeps
+    # concurrent checkouts of overlapping carts from deadlocking
+    book_ids = sorted(quantities)
+    books = await get_books_by_ids(db, book_ids, for_update=True)
+    
+    for book_id, quantity in quantities.items():
+        book = books.get(book_id)
+        if not book:
+            await db.rollback()
+            raise HTTPException(status_code=404, detail=f"Book with ID {book_id} not found")
+        
+        # Check if book is in stock
+        if book.stock < quantity:
+            # Build the message before rollback expires the loaded book
+            detail = f"Not enough stock for book '{book.title}'. Available: {book.stock}"
+            await db.rollback()
+            raise HTTPException(status_code=400, detail=detail)
+    
+    # Decrement stock for every book in one conditional UPDATE; the stock guard
+    # also protects databases without row locks (SQLite)
+    reserved = case(quantities, value=Book.id)
+    result = await db.execute(
+        update(Book)
+        .where(Book.id.in_(book_ids), Book.stock >= reserved)
+        .values(stock=Book.stock - reserved)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != len(book_ids):
+        await db.rollback()
+        raise HTTPException(
+            status_code=409, detail="Stock changed while placing the order, please retry"
+        )
+    
+    # Create order together with its items (flushed as one batched insert)
+    order = Order(
+        id=generate_uuid(),
+        user_id=user_id,
+        total_amount=sum(books[book_id].price * quantity for book_id, quantity in quantities.items()),
+        shipping_address=order_in.shipping_address,
+        status="pending",
+        item_count=sum(quantities.values()),
+        items=[
+            OrderItem(
+                id=generate_uuid(),
+                book_id=book_id,
+                quantity=quantity,
+                unit_price=books[book_id].price,
+            )
+            for book_id, quantity in quantities.items()
+        ],
+    )
+    db.add(order)
+    
+    if idempotency_key:
+        # Drop an expired key that has not been purged yet so it can be reused
+        await db.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key == idempotency_key,
+                IdempotencyKey.created_at < expiry_cutoff()
+            ).execution_options(synchronize_session=False)
+        )
+        await db.flush()
+        db.add(IdempotencyKey(
+            id=generate_uuid(),
+            user_id=user_id,
+            key=idempotency_key,
+            request_hash=hash_request(order_in),
+            order_id=order.id,
+            response_body=schemas.Order.model_validate(order).model_dump_json(),
+        ))
+    
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        if not idempotency_key:
+            raise
+        # A concurrent request with the same key won the race
+        raise HTTPException(
+            status_code=409,
+            detail="A request with this Idempotency-Key is already being processed"
+        )
+    
+    # Cached catalog entries carry the old stock of these books. Reads of other
+    # users may still go to a replica that lacks the order and cache the old
+    # stock again, so drop the entries once more when replicas caught up.
+    tags = [book_tag(book_id) for book_id in book_ids]
+    await catalog_cache.invalidate_tags(tags)
+    if replica_router.engines:
+        invalidate_tags_later(catalog_cache, tags, settings.REPLICA_PIN_SECONDS)
+    # The order and its items stay loaded after commit; no refresh needed
+    return order
@@ -1,31 +1,43 @@
 import uuid
-from typing import List, Optional
+from typing import List, Optional, Set
 
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from sqlalchemy.exc import IntegrityError
 
 from app.models.wishlist import WishlistItem
 from app.schemas.wishlist import WishlistItemCreate
 
 
-def get_wishlist_items(db: Session, user_id: str) -> List[WishlistItem]:
-    """Get all wishlist items for a user, with book details loaded"""
-    return db.query(WishlistItem).filter(WishlistItem.user_id == user_id).all()
+async def get_wishlist_items(
+    db: AsyncSession, user_id: str, skip: int = 0, limit: Optional[int] = None
+) -> List[WishlistItem]:
+    """Get wishlist items for a user in the order they were added, with book details loaded"""
+    query = select(WishlistItem).options(
+        joinedload(WishlistItem.book)
+    ).where(
+        WishlistItem.user_id == user_id
+    ).order_by(WishlistItem.added_at, WishlistItem.id).offset(skip)
+    if limit is not None:
+        query = query.limit(limit)
+    return (await db.execute(query)).scalars().all()
 
 
-def get_wishlist_item(db: Session, user_id: str, book_id: str) -> Optional[WishlistItem]:
+async def get_wishlist_item(db: AsyncSession, user_id: str, book_id: str) -> Optional[WishlistItem]:
     """Get a specific wishlist item by user_id and book_id"""
-    return db.query(WishlistItem).filter(
+    result = await db.execute(select(WishlistItem).where(
         WishlistItem.user_id == user_id,
         WishlistItem.book_id == book_id
-    ).first()
+    ))
+    return result.scalars().first()
 
 
-def create_wishlist_item(db: Session, user_id: str, item_in: WishlistItemCreate) -> WishlistItem:
+async def create_wishlist_item(db: AsyncSession, user_id: str, item_in: WishlistItemCreate) -> WishlistItem:
     """Add a book to the user's wishlist"""
     # Check if the item is already in the wishlist
-    existing_item = get_wishlist_item(db, user_id, item_in.book_id)
+    existing_item = await get_wishlist_item(db, user_id, item_in.book_id)
     if existing_item:
         return existing_item
     
@@ -37,31 +49,43 @@ def create_wishlist_item(db: Session, user_id: str, item_in: WishlistItemCreate)
     )
     try:
         db.add(db_item)
-        db.commit()
-        db.refresh(db_item)
+        await db.commit()
+        await db.refresh(db_item)
         return db_item
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=400,
             detail="Book or user does not exist, or item is already in wishlist"
         )
 
 
-def delete_wishlist_item(db: Session, user_id: str, book_id: str) -> bool:
+async def delete_wishlist_item(db: AsyncSession, user_id: str, book_id: str) -> bool:
     """Remove a book from the user's wishlist"""
-    item = get_wishlist_item(db, user_id, book_id)
+    item = await get_wishlist_item(db, user_id, book_id)
     if not item:
         return False
     
-    db.delete(item)
-    db.commit()
+    await db.delete(item)
+    await db.commit()
     return True
 
 
-def check_wishlist_item_exists(db: Session, user_id: str, book_id: str) -> bool:
+async def check_wishlist_item_exists(db: AsyncSession, user_id: str, book_id: str) -> bool:
     """Check if a book is in the user's wishlist"""
-    return db.query(WishlistItem).filter(
+    count = await db.scalar(select(func.count()).select_from(WishlistItem).where(
         WishlistItem.user_id == user_id,
         WishlistItem.book_id == book_id
-    ).count() > 0 
\ No newline at end of file
+    ))
+    return count > 0
+
+
+async def get_wishlisted_book_ids(db: AsyncSession, user_id: str, book_ids: List[str]) -> Set[str]:
+    """Return the subset of book_ids that are in the user's wishlist"""
+    if not book_ids:
+        return set()
+    result = await db.execute(select(WishlistItem.book_id).where(
+        WishlistItem.user_id == user_id,
+        WishlistItem.book_id.in_(set(book_ids))
+    ))
+    return set(result.scalars())
@@ -0,0 +1,81 @@
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Select, case, func, literal_column, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.book import Book
+
+# Price bands as (label, lower bound inclusive, upper bound exclusive)
+PRICE_BANDS = [
+    ("under-10", None, 10),
+    ("10-20", 10, 20),
+    ("20-50", 20, 50),
+    ("50-plus", 50, None),
+]
+
+
+def price_band(price: ColumnElement) -> ColumnElement:
+    """
+    Label of the price band of a price. Labels and bounds are rendered inline
+    so PostgreSQL sees the same expression in the select list and GROUP BY.
+    """
+    whens = []
+    for label, lower, upper in PRICE_BANDS[:-1]:
+        whens.append((price < literal_column(str(upper)), literal_column(f"'{label}'")))
+    return case(*whens, else_=literal_column(f"'{PRICE_BANDS[-1][0]}'"))
+
+
+def facet_counts_query(filtered: Select, dialect_name: str) -> Select:
+    """
+    One query counting the books of a filtered Book query per category, per
+    format and per price band, as (facet, value, count) rows.
+
+    PostgreSQL computes the three groupings in one pass with GROUPING SETS;
+    other dialects (SQLite in tests) use a UNION ALL of three GROUP BYs.
+    """
+    books = filtered.with_only_columns(Book.category, Book.format, Book.price).order_by(None).subquery()
+    band = price_band(books.c.price)
+    
+    if dialect_name == "postgresql":
+        facet = case(
+            (func.grouping(books.c.category) == 0, literal_column("'category'")),
+            (func.grouping(books.c.format) == 0, literal_column("'format'")),
+            else_=literal_column("'price'"),
+        )
+        return select(
+            facet.label("facet"),
+            func.coalesce(books.c.category, books.c.format, band).label("value"),
+            func.count().label("count"),
+        ).group_by(func.grouping_sets(books.c.category, books.c.format, band))
+    
+    return union_all(*(
+        select(literal_column(f"'{name}'").label("facet"), column.label("value"), func.count().label("count"))
+        .group_by(column)
+        for name, column in (("category", books.c.category), ("format", books.c.format), ("price", band))
+    ))
+
+
+async def count_facets(db: AsyncSession, filtered: Select) -> Dict[str, Any]:
+    """
+    Facet counts of a filtered Book query: the total and the counts per
+    category and format (most common first) and per price band (in band
+    order, including empty bands).
+    """
+    rows = (await db.execute(facet_counts_query(filtered, db.get_bind().dialect.name))).all()
+    counts: Dict[str, Dict[Optional[str], int]] = {"category": {}, "format": {}, "price": {}}
+    for facet, value, count in rows:
+        counts[facet][value] = count
+    
+    def by_count(values: Dict[Optional[str], int]) -> List[Dict[str, Any]]:
+        return [
+            {"value": value, "count": count}
+            for value, count in sorted(values.items(), key=lambda item: (-item[1], item[0] or ""))
+        ]
+    
+    return {
+        "total": sum(counts["category"].values()),
+        "category": by_count(counts["category"]),
+        "format": by_count(counts["format"]),
+        "price": [{"value": label, "count": counts["price"].get(label, 0)} for label, _, _ in PRICE_BANDS],
+    }
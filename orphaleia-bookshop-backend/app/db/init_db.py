@@ -1,10 +1,12 @@
 import logging
+from datetime import datetime
 from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.core.config import settings
 from app.core.security import get_password_hash, generate_uuid
 from app.db import base  # noqa: F401
+from app.db.bulk import book_values, insert_books, parse_book
 
 from app.data.sample_books import books as sample_books
 
@@ -36,28 +38,9 @@ def init_db(db: Session) -> None:
         db.commit()
         logger.info("Admin user created")
     
-    # Create sample books
-    for book_data in sample_books:
-        book = db.query(models.Book).filter(models.Book.isbn == book_data["isbn"]).first()
-        if not book:
-            book_id = book_data.get("id", generate_uuid())
-            book = models.Book(
-                id=book_id,
-                title=book_data["title"],
-                author=book_data["author"],
-                description=book_data["description"],
-                cover=book_data["cover"],
-                price=book_data["price"],
-                category=book_data["category"],
-                publication_date=book_data["publicationDate"],
-                publisher=book_data["publisher"],
-                isbn=book_data["isbn"],
-                pages=book_data["pages"],
-                format=book_data["format"],
-                featured=book_data.get("featured", False),
-                stock=20,  # Default stock
-            )
-            db.add(book)
-        
+    # Create sample books, skipping those already present
+    now = datetime.utcnow()
+    values = [book_values(parse_book(book_data, default_stock=20), now) for book_data in sample_books]
+    inserted = insert_books(db.connection(), values)
     db.commit()
-    logger.info("Sample books created") 
\ No newline at end of file
+    logger.info("Sample books created: %d new", inserted)
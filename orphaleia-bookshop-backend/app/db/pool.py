@@ -0,0 +1,84 @@
+import bisect
+import threading
+import time
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds (seconds) of the connection checkout wait-time buckets
+WAIT_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class WaitTimeHistogram:
+    """
+    Cumulative histogram of connection checkout times.
+    """
+
+    def __init__(self, buckets: Sequence[float] = WAIT_TIME_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.count += 1
+            self.sum += seconds
+            self.max = max(self.max, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self.counts)
+            count, total, slowest = self.count, self.sum, self.max
+        cumulative: List[int] = []
+        for bucket_count in counts:
+            cumulative.append((cumulative[-1] if cumulative else 0) + bucket_count)
+        buckets = {str(bound): cumulative[index] for index, bound in enumerate(self.buckets)}
+        buckets["+Inf"] = cumulative[-1]
+        return {"buckets": buckets, "count": count, "sum": total, "max": slowest}
+
+
+class TimedPoolMixin:
+    """
+    Records how long each connection checkout takes, including waiting for a
+    free connection, opening a new one and the pre-ping round trip.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.wait_times = WaitTimeHistogram()
+        self.timeouts = 0
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait_times.observe(time.perf_counter() - start)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            # Negative until the pool itself is full
+            "overflow": max(self.overflow(), 0),
+            "timeouts": self.timeouts,
+            "checkout_seconds": self.wait_times.snapshot(),
+        }
+
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
@@ -0,0 +1,52 @@
+import re
+from typing import Optional, Tuple
+
+from sqlalchemy import Select, case, func, literal_column, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.book import Book
+
+# Text search configuration used by the search_vector trigger
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def build_tsquery(search: str) -> Optional[str]:
+    """
+    Turn free text into a to_tsquery() expression.
+
+    All words must match; the last one is matched as a prefix so results
+    keep up with search-as-you-type input.
+    """
+    tokens = _TOKEN_RE.findall(search.lower())
+    if not tokens:
+        return None
+    tokens[-1] = f"{tokens[-1]}:*"
+    return " & ".join(tokens)
+
+
+def apply_search(
+    query: Select, search: str, dialect_name: str
+) -> Tuple[Select, Optional[ColumnElement]]:
+    """
+    Filter a Book query by a search term and return it with a relevance expression.
+
+    PostgreSQL uses the GIN-indexed search_vector; other dialects (SQLite in
+    tests), and searches without any word to look up (e.g. "!!"), fall back
+    to case-insensitive substring matching.
+    """
+    tsquery_text = build_tsquery(search) if dialect_name == "postgresql" else None
+    if tsquery_text is not None:
+        tsquery = func.to_tsquery(SEARCH_CONFIG, tsquery_text)
+        query = query.where(Book.search_vector.op("@@")(tsquery))
+        return query, func.ts_rank_cd(Book.search_vector, tsquery)
+
+    # Escape LIKE wildcards so "%" or "_" don't match every book
+    title_match = Book.title.icontains(search, autoescape=True)
+    author_match = Book.author.icontains(search, autoescape=True)
+    query = query.where(
+        or_(title_match, author_match, Book.description.icontains(search, autoescape=True))
+    )
+    rank = case((title_match, 3), (author_match, 2), else_=1)
+    return query, rank
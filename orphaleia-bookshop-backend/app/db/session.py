@@ -1,11 +1,145 @@
-from sqlalchemy import create_engine
+import asyncio
+import itertools
+import logging
+import uuid
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.db.pool import TimedAsyncQueuePool, TimedQueuePool
+
+logger = logging.getLogger(__name__)
+
+# Async drivers used for each sync database driver
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url(database_uri: str) -> URL:
+    """
+    Derive the async (asyncpg / aiosqlite) URL from a sync database URI.
+    """
+    url = make_url(database_uri)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername))
+
+
+def engine_options(database_url: Union[str, URL], asynchronous: bool) -> Dict[str, Any]:
+    """
+    Pool and driver options shared by all engines, from the DB_* settings.
+    """
+    options: Dict[str, Any] = {
+        "poolclass": TimedAsyncQueuePool if asynchronous else TimedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if settings.DB_PGBOUNCER and make_url(database_url).drivername == "postgresql+asyncpg":
+        # Disable asyncpg's statement caches and give every prepared statement
+        # a unique name, so statements never clash across server connections
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    return options
+
 
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, pool_pre_ping=True)
+# Sync engine, used by create_tables.py, init_db and Alembic
+engine = create_engine(
+    settings.SQLALCHEMY_DATABASE_URI,
+    **engine_options(settings.SQLALCHEMY_DATABASE_URI, asynchronous=False),
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine, used by the API
+async_database_url = (
+    settings.SQLALCHEMY_ASYNC_DATABASE_URI or get_async_database_url(settings.SQLALCHEMY_DATABASE_URI)
+)
+async_engine = create_async_engine(async_database_url, **engine_options(async_database_url, asynchronous=True))
+# Objects stay loaded after commit: lazy loading is not available in async code
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+
+class ReplicaRouter:
+    """
+    Read replicas for read-only endpoints, used round-robin among the ones
+    that passed their last health check.
+    """
+
+    def __init__(self, database_uris: List[str]):
+        urls = [get_async_database_url(uri) for uri in database_uris]
+        self.engines = [
+            create_async_engine(url, **engine_options(url, asynchronous=True))
+            for url in urls
+        ]
+        self.sessionmakers = [
+            async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+            for engine in self.engines
+        ]
+        self.healthy = [True] * len(self.engines)
+        self._counter = itertools.count()
+
+    def choose(self) -> Optional[int]:
+        """Index of the replica to read from, or None to use the primary"""
+        candidates = [index for index, healthy in enumerate(self.healthy) if healthy]
+        if not candidates:
+            return None
+        return candidates[next(self._counter) % len(candidates)]
+
+    def mark_unhealthy(self, index: int) -> None:
+        if self.healthy[index]:
+            logger.warning("Read replica %d is unavailable, reading from the primary", index)
+        self.healthy[index] = False
+
+    async def _ping(self, index: int) -> None:
+        async with self.engines[index].connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def check_health(self) -> None:
+        """Ping every replica and update its health"""
+        for index in range(len(self.engines)):
+            try:
+                await asyncio.wait_for(self._ping(index), settings.REPLICA_HEALTH_CHECK_TIMEOUT_SECONDS)
+            except Exception:
+                self.mark_unhealthy(index)
+            else:
+                if not self.healthy[index]:
+                    logger.info("Read replica %d is available again", index)
+                self.healthy[index] = True
+
+    def stats(self) -> List[dict]:
+        return [
+            {"replica": index, "healthy": healthy}
+            for index, healthy in enumerate(self.healthy)
+        ]
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
+
+
+replica_router = ReplicaRouter(settings.SQLALCHEMY_REPLICA_URIS)
+
+
+def api_engines() -> List[Tuple[str, AsyncEngine]]:
+    """
+    Engines used by the API, by name: the primary and each read replica.
+    """
+    return [("primary", async_engine)] + [
+        (f"replica{index}", engine) for index, engine in enumerate(replica_router.engines)
+    ]
+
 
 def get_db():
     """
@@ -15,4 +149,12 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function to get an async DB session.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -2,4 +2,6 @@ from app.models.user import User
 from app.models.book import Book
 from app.models.order import Order, OrderItem
 from app.models.shipping_address import ShippingAddress
-from app.models.wishlist import WishlistItem 
\ No newline at end of file
+from app.models.wishlist import WishlistItem
+from app.models.idempotency_key import IdempotencyKey
+from app.models.import_job import ImportJob 
\ No newline at end of file
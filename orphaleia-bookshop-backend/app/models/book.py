@@ -1,6 +1,7 @@
 from datetime import datetime
-from sqlalchemy import Boolean, Column, DateTime, Float, Integer, String, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import DDL, Boolean, Column, DateTime, Float, Index, Integer, String, Text, event
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 
 from app.db.base_class import Base
 
@@ -22,7 +23,43 @@ class Book(Base):
     stock = Column(Integer, default=0)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Weighted full-text document (title > author > description), maintained by
+    # a trigger on PostgreSQL. Unused on other dialects.
+    search_vector = deferred(Column(Text().with_variant(TSVECTOR(), "postgresql"), nullable=True))
     
     # Relationships
     order_items = relationship("OrderItem", back_populates="book")
-    # wishlisted_by relationship is defined in WishlistItem model with backref 
\ No newline at end of file
+    # wishlisted_by relationship is defined in WishlistItem model with backref
+    
+    # Keyset pagination indexes (sort column + id tiebreaker)
+    __table_args__ = (
+        Index("ix_book_title_id", "title", "id"),
+        Index("ix_book_price_id", "price", "id"),
+    )
+
+
+# Keep search_vector current and indexed when the table is created with
+# create_all(); the Alembic migration installs the same objects.
+event.listen(
+    Book.__table__,
+    "after_create",
+    DDL(
+        """
+        CREATE OR REPLACE FUNCTION book_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(NEW.author, '')), 'B') ||
+                setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER book_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF title, author, description ON book
+            FOR EACH ROW EXECUTE FUNCTION book_search_vector_update();
+
+        CREATE INDEX ix_book_search_vector ON book USING gin (search_vector);
+        """
+    ).execute_if(dialect="postgresql"),
+)
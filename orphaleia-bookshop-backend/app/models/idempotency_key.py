@@ -0,0 +1,22 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, ForeignKey, String, Text, UniqueConstraint
+
+from app.db.base_class import Base
+
+
+class IdempotencyKey(Base):
+    """Model for Idempotency-Key headers - remembers the response of a completed request"""
+    __tablename__ = "idempotency_key"
+    
+    id = Column(String, primary_key=True, index=True)
+    user_id = Column(String, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    key = Column(String, nullable=False)
+    request_hash = Column(String, nullable=False)  # SHA-256 of the request body
+    order_id = Column(String, ForeignKey("order.id", ondelete="CASCADE"), nullable=True)
+    response_body = Column(Text, nullable=False)  # Serialized response returned on replay
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    
+    # Keys are scoped per user; the constraint also backs the replay lookup
+    __table_args__ = (
+        UniqueConstraint('user_id', 'key', name='uq_user_idempotency_key'),
+    )
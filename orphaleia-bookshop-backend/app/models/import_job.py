@@ -0,0 +1,25 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+
+from app.db.base_class import Base
+
+
+class ImportJob(Base):
+    """Model for admin catalog imports - progress and row errors of a background load"""
+    __tablename__ = "import_job"
+    
+    id = Column(String, primary_key=True, index=True)
+    user_id = Column(String, ForeignKey("user.id", ondelete="SET NULL"), nullable=True)
+    format = Column(String, nullable=False)  # jsonl or csv
+    status = Column(String, nullable=False, default="pending")  # pending, running, completed, failed
+    rows_read = Column(Integer, nullable=False, default=0)
+    rows_inserted = Column(Integer, nullable=False, default=0)
+    rows_updated = Column(Integer, nullable=False, default=0)
+    rows_failed = Column(Integer, nullable=False, default=0)
+    errors = Column(Text, nullable=False, default="[]")  # JSON list of row errors, capped
+    error = Column(Text, nullable=True)  # Why the whole job failed
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    # Refreshed by the worker running the import; stale while no worker does
+    heartbeat_at = Column(DateTime, nullable=True)
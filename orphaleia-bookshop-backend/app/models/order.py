@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, DateTime, Enum, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, Enum, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -22,6 +22,12 @@ class Order(Base):
     # Relationships
     user = relationship("User", back_populates="orders")
     items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
+    
+    # Keyset pagination indexes (newest first, id tiebreaker)
+    __table_args__ = (
+        Index("ix_order_created_at_id", "created_at", "id"),
+        Index("ix_order_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
 
 class OrderItem(Base):
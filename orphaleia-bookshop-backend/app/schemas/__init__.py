@@ -1,6 +1,25 @@
-from app.schemas.user import User, UserCreate, UserInDB, UserUpdate
+from app.schemas.user import User, UserCreate, UserInDB, UserPrincipal, UserUpdate
 from app.schemas.token import Token, TokenPayload
-from app.schemas.book import Book, BookCreate, BookUpdate
-from app.schemas.order import Order, OrderCreate, OrderUpdate
+from app.schemas.book import (
+    Book,
+    BookBatchItem,
+    BookBatchRequest,
+    BookBatchResponse,
+    BookCreate,
+    BookFacets,
+    BookUpdate,
+    FacetCount,
+    Suggestion,
+    SuggestionKind,
+)
+from app.schemas.import_job import ImportJob, ImportJobStatus, ImportRowError
+from app.schemas.order import Order, OrderCreate, OrderSummary, OrderUpdate
 from app.schemas.shipping_address import ShippingAddress, ShippingAddressCreate, ShippingAddressUpdate
-from app.schemas.wishlist import WishlistItem, WishlistItemCreate, WishlistItemUpdate, WishlistItemWithBook 
\ No newline at end of file
+from app.schemas.wishlist import (
+    WishlistCheckRequest,
+    WishlistCheckResponse,
+    WishlistItem,
+    WishlistItemCreate,
+    WishlistItemUpdate,
+    WishlistItemWithBook,
+) 
\ No newline at end of file
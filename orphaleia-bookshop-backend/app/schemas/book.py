@@ -1,5 +1,6 @@
 from datetime import datetime
-from typing import Optional
+from enum import Enum
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -61,4 +62,47 @@ class Book(BookInDBBase):
 
 # Properties properties stored in DB
 class BookInDB(BookInDBBase):
-    pass 
\ No newline at end of file
+    pass 
+
+
+# Batch lookup of books by id
+class BookBatchRequest(BaseModel):
+    ids: List[str] = Field(..., max_length=500)
+
+
+# Result for one requested id; book is None when not found
+class BookBatchItem(BaseModel):
+    id: str
+    found: bool
+    book: Optional[Book] = None
+
+
+class BookBatchResponse(BaseModel):
+    books: List[BookBatchItem]
+
+
+# Number of books with a facet value (category, format or price band)
+class FacetCount(BaseModel):
+    value: Optional[str] = None
+    count: int
+
+
+# Facet counts for the filters of a book listing
+class BookFacets(BaseModel):
+    total: int
+    category: List[FacetCount]
+    format: List[FacetCount]
+    price: List[FacetCount]
+
+
+class SuggestionKind(str, Enum):
+    TITLE = "title"
+    AUTHOR = "author"
+
+
+# Autocomplete suggestion: a book title or an author name. book_id is set
+# for titles of a single book.
+class Suggestion(BaseModel):
+    text: str
+    kind: SuggestionKind
+    book_id: Optional[str] = None
@@ -0,0 +1,44 @@
+import json
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, field_validator
+
+
+class ImportJobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+# A row of the uploaded file that was not imported
+class ImportRowError(BaseModel):
+    row: int  # Record number in the file, starting at 1
+    isbn: Optional[str] = None
+    error: str
+
+
+# Properties to return to client
+class ImportJob(BaseModel):
+    id: str
+    format: str
+    status: ImportJobStatus
+    rows_read: int
+    rows_inserted: int
+    rows_updated: int
+    rows_failed: int
+    errors: List[ImportRowError]
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @field_validator("errors", mode="before")
+    def decode_errors(cls, v):
+        # Stored as a JSON list
+        return json.loads(v) if isinstance(v, str) else v
+
+    class Config:
+        from_attributes = True
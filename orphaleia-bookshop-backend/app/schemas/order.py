@@ -75,5 +75,10 @@ class Order(OrderInDBBase):
     items: List[OrderItem]
 
 
+# Order without its items, for lightweight listings
+class OrderSummary(OrderInDBBase):
+    pass
+
+
 class OrderInDB(OrderInDBBase):
     pass 
\ No newline at end of file
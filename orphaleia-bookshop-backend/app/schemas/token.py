@@ -9,4 +9,8 @@ class Token(BaseModel):
 
 
 class TokenPayload(BaseModel):
-    sub: Optional[str] = None 
\ No newline at end of file
+    sub: Optional[str] = None
+    # Claims embedded when JWT_EMBED_CLAIMS is enabled
+    email: Optional[str] = None
+    is_active: Optional[bool] = None
+    is_admin: Optional[bool] = None 
\ No newline at end of file
@@ -42,4 +42,12 @@ class User(UserInDBBase):
 
 # Additional properties stored in DB
 class UserInDB(UserInDBBase):
-    hashed_password: str 
\ No newline at end of file
+    hashed_password: str
+
+
+# Authenticated user as seen by request handlers, without the full DB row
+class UserPrincipal(BaseModel):
+    id: str
+    email: str
+    is_active: bool = True
+    is_admin: bool = False
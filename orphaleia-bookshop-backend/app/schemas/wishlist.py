@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -33,4 +33,14 @@ class WishlistItem(WishlistItemBase):
 
 # Schema for returning wishlist items with full book details
 class WishlistItemWithBook(WishlistItem):
-    book: Optional[Book] = None 
\ No newline at end of file
+    book: Optional[Book] = None
+
+
+# Schema for checking many books against the wishlist at once
+class WishlistCheckRequest(BaseModel):
+    book_ids: List[str] = Field(..., max_length=500)
+
+
+# Schema for the subset of requested books that are wishlisted
+class WishlistCheckResponse(BaseModel):
+    book_ids: List[str]
@@ -0,0 +1,123 @@
+"""
+Benchmark command line.
+
+    python -m benchmarks seed --books 100000 --users 1000
+    python -m benchmarks run mix --concurrency 50 --duration 60 --save results/mix.json
+    python -m benchmarks run catalog --url http://localhost:8000 --compare results/catalog.json
+    python -m benchmarks compare results/new.json results/old.json
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+# Run from the backend directory so `app` and `main` are importable
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+DEFAULT_MANIFEST = os.path.join(os.path.dirname(__file__), "results", "manifest.json")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Orphaleia API benchmarks")
+    parser.add_argument(
+        "--database-uri",
+        help="Database to seed / serve in-process (default: SQLALCHEMY_DATABASE_URI from the environment)",
+    )
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST, help="Seed manifest path")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    seed = commands.add_parser("seed", help="Create synthetic benchmark data")
+    seed.add_argument("--books", type=int, default=100_000)
+    seed.add_argument("--users", type=int, default=1_000)
+    seed.add_argument("--wishlist-per-user", type=int, default=10)
+    seed.add_argument("--orders-per-user", type=int, default=5)
+    seed.add_argument("--batch-size", type=int, default=5_000)
+    seed.add_argument("--random-seed", type=int, default=42)
+    
+    run = commands.add_parser("run", help="Replay a scenario and report latency percentiles")
+    run.add_argument("scenario", help="Scenario name (see `list`)")
+    run.add_argument("--url", help="Base URL of a running server (default: the app in this process)")
+    run.add_argument("--concurrency", type=int, default=20, help="Virtual users")
+    run.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    run.add_argument("--timeout", type=float, default=30.0, help="Request timeout in seconds")
+    run.add_argument("--random-seed", type=int, default=1)
+    run.add_argument("--save", help="Write the result as a JSON baseline")
+    run.add_argument("--compare", help="Baseline JSON to compare with")
+    
+    compare = commands.add_parser("compare", help="Compare two saved results")
+    compare.add_argument("result")
+    compare.add_argument("baseline")
+    
+    commands.add_parser("list", help="List the scenarios")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if args.database_uri:
+        # Must be set before the app's settings are imported
+        os.environ["SQLALCHEMY_DATABASE_URI"] = args.database_uri
+    
+    from benchmarks import report
+    
+    if args.command == "seed":
+        from benchmarks.seed import seed
+        manifest = seed(
+            books=args.books,
+            users=args.users,
+            wishlist_per_user=args.wishlist_per_user,
+            orders_per_user=args.orders_per_user,
+            random_seed=args.random_seed,
+            batch_size=args.batch_size,
+        )
+        os.makedirs(os.path.dirname(os.path.abspath(args.manifest)), exist_ok=True)
+        report.save_json(manifest, args.manifest)
+        print(f"Manifest written to {args.manifest}")
+        return
+    
+    from benchmarks.scenarios import SCENARIOS
+    
+    if args.command == "list":
+        for name, scenario in SCENARIOS.items():
+            print(f"{name:<16}{scenario.description}")
+        return
+    
+    if args.command == "compare":
+        print(report.format_comparison(report.load_json(args.result), report.load_json(args.baseline)))
+        return
+    
+    from benchmarks.runner import open_client, run_scenario
+    
+    if args.scenario not in SCENARIOS:
+        sys.exit(f"Unknown scenario {args.scenario!r}, choose from: {', '.join(SCENARIOS)}")
+    manifest = report.load_json(args.manifest)
+    
+    async def run() -> report.Recorder:
+        async with open_client(args.url, args.timeout) as client:
+            return await run_scenario(
+                SCENARIOS[args.scenario], client, manifest, args.concurrency, args.duration, args.random_seed
+            )
+    
+    recorder = asyncio.run(run())
+    result = report.build_result(recorder, args.scenario, {
+        "url": args.url or "in-process",
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "random_seed": args.random_seed,
+        "books": manifest["books"],
+        "users": manifest["users"],
+    })
+    print(report.format_result(result))
+    if args.compare:
+        print()
+        print(report.format_comparison(result, report.load_json(args.compare)))
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        report.save_json(result, args.save)
+        print(f"Result written to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Latency samples, per-endpoint summaries and JSON baselines.
+"""
+import json
+import platform
+import subprocess
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+# Summary fields compared against a baseline, and whether higher is better
+COMPARED_FIELDS = {"rps": True, "p50_ms": False, "p95_ms": False, "p99_ms": False, "mean_bytes": False}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Linear-interpolated percentile of pre-sorted values"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class Recorder:
+    """
+    Collects (latency, status, response size) samples per endpoint label
+    during a run.
+    """
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.sizes: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.checks: Dict[str, Any] = {}
+        self.started = 0.0
+        self.elapsed = 0.0
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+
+    def stop(self) -> None:
+        self.elapsed = time.perf_counter() - self.started
+
+    def record(self, label: str, seconds: float, status: int, size: int = 0) -> None:
+        self.latencies[label].append(seconds)
+        self.sizes[label] += size
+        self.statuses[label][status] += 1
+
+    def summarize(self) -> Dict[str, Dict[str, Any]]:
+        """Throughput, error count, latency percentiles and response size per endpoint and in total"""
+        summary = {}
+        labels = sorted(self.latencies)
+        for label in labels + ["total"]:
+            if label == "total":
+                values = sorted(value for label in labels for value in self.latencies[label])
+                size = sum(self.sizes.values())
+                statuses: Dict[int, int] = defaultdict(int)
+                for label_statuses in self.statuses.values():
+                    for status, count in label_statuses.items():
+                        statuses[status] += count
+            else:
+                values = sorted(self.latencies[label])
+                statuses = self.statuses[label]
+                size = self.sizes[label]
+            summary[label] = {
+                "count": len(values),
+                # Connection failures are recorded as status 0
+                "errors": sum(count for status, count in statuses.items() if status == 0 or status >= 500),
+                "statuses": {str(status): count for status, count in sorted(statuses.items())},
+                "rps": len(values) / self.elapsed if self.elapsed else 0.0,
+                "mean_ms": 1000 * sum(values) / len(values) if values else 0.0,
+                "p50_ms": 1000 * percentile(values, 0.50),
+                "p95_ms": 1000 * percentile(values, 0.95),
+                "p99_ms": 1000 * percentile(values, 0.99),
+                "max_ms": 1000 * values[-1] if values else 0.0,
+                # Response body bytes (before transfer compression)
+                "mean_bytes": size / len(values) if values else 0.0,
+            }
+        return summary
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_result(recorder: Recorder, scenario: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "scenario": scenario,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "options": options,
+        "elapsed_s": recorder.elapsed,
+        "endpoints": recorder.summarize(),
+        "checks": recorder.checks,
+    }
+
+
+def save_json(data: Dict[str, Any], path: str) -> None:
+    """Write a result or seed manifest"""
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def load_json(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    lines = [
+        f"Scenario {result['scenario']} ({result['elapsed_s']:.1f}s, commit {result.get('git_commit') or 'unknown'})",
+        f"{'endpoint':<24}{'count':>8}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'KB/req':>10}",
+    ]
+    for label, stats in result["endpoints"].items():
+        lines.append(
+            f"{label:<24}{stats['count']:>8}{stats['errors']:>8}{stats['rps']:>10.1f}"
+            f"{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}{stats['max_ms']:>10.1f}"
+            f"{stats.get('mean_bytes', 0.0) / 1024:>10.1f}"
+        )
+    for name, value in result.get("checks", {}).items():
+        lines.append(f"check {name}: {value}")
+    return "\n".join(lines)
+
+
+def format_comparison(result: Dict[str, Any], baseline: Dict[str, Any]) -> str:
+    """
+    Change of throughput and latency percentiles per endpoint, relative to the
+    baseline. Positive percentages are improvements.
+    """
+    lines = [
+        f"Compared with {baseline['scenario']} at commit {baseline.get('git_commit') or 'unknown'} "
+        f"({baseline['started_at']})",
+        f"{'endpoint':<24}" + "".join(f"{field:>12}" for field in COMPARED_FIELDS),
+    ]
+    for label, stats in result["endpoints"].items():
+        before = baseline["endpoints"].get(label)
+        if not before:
+            lines.append(f"{label:<24}{'(new)':>12}")
+            continue
+        cells = []
+        for field, higher_is_better in COMPARED_FIELDS.items():
+            # Baselines from older versions may lack a field
+            if not before.get(field):
+                cells.append(f"{'n/a':>12}")
+                continue
+            change = (stats[field] - before[field]) / before[field] * 100
+            if not higher_is_better:
+                # "or 0.0" avoids printing -0.0
+                change = -change or 0.0
+            cells.append(f"{change:>+11.1f}%")
+        lines.append(f"{label:<24}" + "".join(cells))
+    return "\n".join(lines)
@@ -0,0 +1,127 @@
+"""
+Drives a scenario's virtual users against the app and records the latency of
+every request, labelled by endpoint.
+"""
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+from benchmarks.report import Recorder
+
+
+@asynccontextmanager
+async def lifespan(app: Any) -> AsyncIterator[None]:
+    """
+    Run the app's startup and shutdown handlers, which ASGITransport skips.
+    """
+    received: asyncio.Queue = asyncio.Queue()
+    sent: asyncio.Queue = asyncio.Queue()
+    await received.put({"type": "lifespan.startup"})
+    task = asyncio.create_task(app({"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}, received.get, sent.put))
+    message = await sent.get()
+    if message["type"] != "lifespan.startup.complete":
+        raise RuntimeError(f"App startup failed: {message.get('message', message['type'])}")
+    try:
+        yield
+    finally:
+        await received.put({"type": "lifespan.shutdown"})
+        await sent.get()
+        await task
+
+
+@asynccontextmanager
+async def open_client(url: Optional[str], timeout: float) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    HTTP client for a running server at url, or for the app in this process.
+    """
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    if url:
+        async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+            yield client
+        return
+    
+    from main import app
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=timeout) as client:
+            yield client
+
+
+class VirtualUser:
+    """
+    One simulated client: its own random stream, token and request helper.
+    """
+
+    def __init__(self, number: int, client: httpx.AsyncClient, recorder: Recorder, manifest: Dict[str, Any], seed: int):
+        self.number = number
+        self.client = client
+        self.recorder = recorder
+        self.manifest = manifest
+        self.rng = random.Random(seed * 100_003 + number)
+        self.headers: Dict[str, str] = {}
+        self.state: Dict[str, Any] = {}
+
+    @property
+    def email(self) -> str:
+        return f"bench-user-{self.number % self.manifest['users']:06d}@example.com"
+
+    async def request(self, label: str, method: str, url: str, record: bool = True, **kwargs: Any) -> httpx.Response:
+        """Send a request; when record is set, time it under label"""
+        headers = {**self.headers, **kwargs.pop("headers", {})}
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=headers, **kwargs)
+        except httpx.HTTPError:
+            if record:
+                self.recorder.record(label, time.perf_counter() - start, 0)
+            raise
+        if record:
+            self.recorder.record(label, time.perf_counter() - start, response.status_code, len(response.content))
+        return response
+
+    async def login(self, record: bool = False) -> None:
+        response = await self.request(
+            "login", "POST", "/api/v1/auth/login", record=record,
+            data={"username": self.email, "password": self.manifest["password"]},
+        )
+        response.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def run_scenario(
+    scenario: Any,
+    client: httpx.AsyncClient,
+    manifest: Dict[str, Any],
+    concurrency: int,
+    duration: float,
+    seed: int = 1,
+) -> Recorder:
+    """
+    Run the scenario with `concurrency` virtual users for `duration` seconds.
+    """
+    recorder = Recorder()
+    users = [VirtualUser(number, client, recorder, manifest, seed) for number in range(concurrency)]
+    # Logging in is setup, not part of the measurement
+    await asyncio.gather(*(scenario.setup(user) for user in users))
+    await scenario.before(users[0])
+    
+    deadline = time.perf_counter() + duration
+    
+    async def loop(user: VirtualUser) -> None:
+        while time.perf_counter() < deadline:
+            action = scenario.pick(user)
+            try:
+                await action(user)
+            except httpx.HTTPError:
+                pass
+    
+    recorder.start()
+    await asyncio.gather(*(loop(user) for user in users))
+    recorder.stop()
+    recorder.checks.update(await scenario.after(users[0], recorder))
+    return recorder
+
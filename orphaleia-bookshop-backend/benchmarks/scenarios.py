@@ -0,0 +1,210 @@
+"""
+Traffic mixes replayed by the virtual users. Each action sends one or two
+requests, recorded under the endpoint label shown in the report.
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.report import Recorder
+from benchmarks.runner import VirtualUser
+
+API = "/api/v1"
+
+Action = Callable[[VirtualUser], Awaitable[None]]
+
+
+def random_book_id(user: VirtualUser) -> str:
+    return f"bench-{user.rng.randrange(user.manifest['books']):07d}"
+
+
+async def browse(user: VirtualUser) -> None:
+    params: Dict[str, Any] = {"limit": 20, "sort": user.rng.choice(["title-asc", "price-asc", "price-desc"])}
+    if user.rng.random() < 0.3:
+        params["category"] = user.rng.choice(user.manifest["categories"])
+    response = await user.request("browse", "GET", f"{API}/books/", params=params)
+    cursor = response.headers.get("x-next-cursor")
+    if cursor and user.rng.random() < 0.4:
+        await user.request("browse-next", "GET", f"{API}/books/", params={**params, "cursor": cursor})
+
+
+# Fields of a grid view, fetched with the sparse fieldset of GET /books
+GRID_FIELDS = "id,title,author,price,cover,stock"
+
+
+async def browse_page(user: VirtualUser, label: str, fields: Optional[str]) -> None:
+    params: Dict[str, Any] = {"limit": 50, "sort": user.rng.choice(["title-asc", "price-asc", "price-desc"])}
+    if fields:
+        params["fields"] = fields
+    await user.request(label, "GET", f"{API}/books/", params=params)
+
+
+async def browse_full(user: VirtualUser) -> None:
+    await browse_page(user, "page-full", None)
+
+
+async def browse_grid(user: VirtualUser) -> None:
+    await browse_page(user, "page-grid", GRID_FIELDS)
+
+
+async def search(user: VirtualUser) -> None:
+    term = user.rng.choice(user.manifest["search_terms"])
+    # Shoppers often search before finishing the word
+    if user.rng.random() < 0.5:
+        term = term[:user.rng.randint(3, len(term))]
+    await user.request("search", "GET", f"{API}/books/", params={"search": term, "sort": "relevance", "limit": 20})
+
+
+async def featured(user: VirtualUser) -> None:
+    await user.request("featured", "GET", f"{API}/books/featured")
+
+
+async def category(user: VirtualUser) -> None:
+    name = user.rng.choice(user.manifest["categories"])
+    await user.request("category", "GET", f"{API}/books/category/{name}", params={"limit": 20})
+
+
+async def book_detail(user: VirtualUser) -> None:
+    await user.request("book", "GET", f"{API}/books/{random_book_id(user)}")
+
+
+async def wishlist(user: VirtualUser) -> None:
+    await user.request("wishlist", "GET", f"{API}/wishlist/", params={"limit": 50})
+
+
+async def wishlist_add(user: VirtualUser) -> None:
+    await user.request("wishlist-add", "POST", f"{API}/wishlist/", json={"book_id": random_book_id(user)})
+
+
+async def order_history(user: VirtualUser) -> None:
+    await user.request("orders", "GET", f"{API}/orders/user", params={"limit": 10, "summary": True})
+
+
+def order_payload(book_ids: List[str]) -> Dict[str, Any]:
+    return {
+        "shipping_address": "1 Benchmark Street",
+        "items": [{"book_id": book_id, "quantity": 1, "unit_price": 0} for book_id in book_ids],
+    }
+
+
+async def checkout(user: VirtualUser) -> None:
+    book_ids = [random_book_id(user) for _ in range(user.rng.randint(1, 2))]
+    await user.request("checkout", "POST", f"{API}/orders/", json=order_payload(book_ids))
+
+
+async def checkout_hot_book(user: VirtualUser) -> None:
+    await user.request("checkout-hot", "POST", f"{API}/orders/", json=order_payload([user.manifest["hot_book_id"]]))
+
+
+async def login(user: VirtualUser) -> None:
+    await user.login(record=True)
+
+
+class Scenario:
+    """
+    Weighted mix of actions run in a loop by every virtual user.
+    """
+
+    def __init__(self, name: str, description: str, actions: List[Tuple[Action, int]], authenticated: bool = True):
+        self.name = name
+        self.description = description
+        self.actions = [action for action, _ in actions]
+        self.weights = [weight for _, weight in actions]
+        self.authenticated = authenticated
+
+    async def setup(self, user: VirtualUser) -> None:
+        if self.authenticated:
+            await user.login()
+
+    async def before(self, user: VirtualUser) -> None:
+        """Runs once after setup, before the measurement"""
+
+    def pick(self, user: VirtualUser) -> Action:
+        return user.rng.choices(self.actions, self.weights)[0]
+
+    async def after(self, user: VirtualUser, recorder: Recorder) -> Dict[str, Any]:
+        """Runs once after the measurement; returns named checks for the report"""
+        return {}
+
+
+class HotCheckoutScenario(Scenario):
+    """
+    Every virtual user buys the same book at once: measures checkout under
+    row-lock contention and checks that no unit was sold twice or lost.
+    """
+
+    def __init__(self):
+        super().__init__(
+            "hot-checkout",
+            "All virtual users check out the same book concurrently",
+            [(checkout_hot_book, 1)],
+        )
+        self.stock_before: Optional[int] = None
+
+    async def stock(self, user: VirtualUser) -> int:
+        response = await user.request(
+            "stock", "GET", f"{API}/books/{user.manifest['hot_book_id']}", record=False
+        )
+        response.raise_for_status()
+        return response.json()["stock"]
+
+    async def before(self, user: VirtualUser) -> None:
+        self.stock_before = await self.stock(user)
+
+    async def after(self, user: VirtualUser, recorder: Recorder) -> Dict[str, Any]:
+        placed = recorder.statuses["checkout-hot"].get(200, 0)
+        stock_after = await self.stock(user)
+        return {
+            "orders_placed": placed,
+            "stock_before": self.stock_before,
+            "stock_after": stock_after,
+            "stock_consistent": self.stock_before - placed == stock_after,
+        }
+
+
+class LoginFloodScenario(Scenario):
+    """
+    Half of the virtual users log in over and over while the other half browse
+    the catalog: catalog latency shows whether password hashing starves the
+    event loop.
+    """
+
+    def __init__(self):
+        super().__init__(
+            "login-flood",
+            "Half of the virtual users log in continuously, half browse the catalog",
+            [(browse, 4), (book_detail, 4), (featured, 2)],
+            authenticated=False,
+        )
+
+    def pick(self, user: VirtualUser) -> Action:
+        if user.number % 2 == 0:
+            return login
+        return super().pick(user)
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in [
+        Scenario(
+            "mix",
+            "Realistic storefront traffic: browsing, search, book pages, wishlist, orders, checkout, login",
+            [
+                (browse, 25), (search, 12), (featured, 8), (category, 10), (book_detail, 20),
+                (wishlist, 6), (wishlist_add, 2), (order_history, 5), (checkout, 4), (login, 2),
+            ],
+        ),
+        Scenario(
+            "catalog",
+            "Anonymous catalog reads only (compare throughput across commits or databases)",
+            [(browse, 35), (search, 15), (featured, 10), (category, 15), (book_detail, 25)],
+            authenticated=False,
+        ),
+        Scenario(
+            "payload",
+            "Listing pages of full books vs. grid fields only (compare KB/req and latency)",
+            [(browse_full, 1), (browse_grid, 1)],
+            authenticated=False,
+        ),
+        HotCheckoutScenario(),
+        LoginFloodScenario(),
+    ]
+}
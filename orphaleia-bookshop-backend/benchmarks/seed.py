@@ -0,0 +1,215 @@
+"""
+Synthetic data for the benchmarks: a catalog shaped like app/data/sample_books.py,
+scaled up, plus users with wishlists and order history.
+
+The data is generated from a fixed random seed, so runs against databases
+seeded with the same parameters are comparable.
+"""
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List
+
+from sqlalchemy import delete, func, insert, select
+
+from app.core.security import get_password_hash
+from app.data.sample_books import books as sample_books
+from app.db.base import Base
+from app.db.session import engine
+from app.models.book import Book
+from app.models.idempotency_key import IdempotencyKey
+from app.models.order import Order, OrderItem
+from app.models.user import User
+from app.models.wishlist import WishlistItem
+
+logger = logging.getLogger(__name__)
+
+# Password shared by every benchmark user (hashed once)
+BENCH_PASSWORD = "benchpassword"
+# Book every hot-checkout virtual user buys; stocked so it never runs out
+HOT_BOOK_ID = "bench-hot"
+HOT_BOOK_STOCK = 10_000_000
+
+CATEGORIES = sorted({book["category"] for book in sample_books} | {
+    "history", "philosophy", "fantasy", "drama", "science", "biography",
+})
+FORMATS = ["Paperback", "Hardcover", "eBook", "Audiobook"]
+PUBLISHERS = sorted({book["publisher"] for book in sample_books})
+COVERS = [book["cover"] for book in sample_books]
+TITLE_WORDS = [
+    "song", "odyssey", "winter", "fragments", "gods", "kings", "sea", "titan",
+    "daughter", "oracle", "labyrinth", "siren", "muse", "shadow", "empire",
+    "voyage", "harbor", "lyre", "olive", "bronze", "marble", "ember", "tide",
+    "garden", "island", "river", "crown", "temple", "wolf", "raven", "storm",
+]
+FIRST_NAMES = ["Madeline", "Emily", "Anne", "Stephen", "Margaret", "Natalie", "Pat", "Homer", "Ovid", "Sappho"]
+LAST_NAMES = ["Miller", "Wilson", "Carson", "Fry", "Atwood", "Haynes", "Barker", "Hughes", "Green", "Ward"]
+# Words that appear in generated titles, used by the search scenarios
+SEARCH_TERMS = TITLE_WORDS[:12]
+
+
+def book_id(index: int) -> str:
+    return f"bench-{index:07d}"
+
+
+def user_email(index: int) -> str:
+    return f"bench-user-{index:06d}@example.com"
+
+
+def generate_books(count: int, rng: random.Random) -> Iterator[Dict[str, Any]]:
+    now = datetime.utcnow()
+    for index in range(count):
+        words = rng.sample(TITLE_WORDS, rng.randint(2, 4))
+        title = " ".join(word.capitalize() for word in words)
+        author = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        template = rng.choice(sample_books)
+        yield {
+            "id": book_id(index),
+            "title": f"{title} {index}",
+            "author": author,
+            "description": f"{template['description']} A story of {words[0]} and {words[-1]}.",
+            "cover": rng.choice(COVERS),
+            "price": round(rng.uniform(4.99, 39.99), 2),
+            "category": rng.choice(CATEGORIES),
+            "publication_date": f"{rng.randint(1950, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "publisher": rng.choice(PUBLISHERS),
+            "isbn": f"979-{index:010d}",
+            "pages": rng.randint(80, 900),
+            "format": rng.choice(FORMATS),
+            "featured": rng.random() < 0.01,
+            "stock": rng.randint(0, 200),
+            "created_at": now,
+            "updated_at": now,
+        }
+
+
+def _batches(rows: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _insert(conn, table, rows: Iterator[Dict[str, Any]], batch_size: int, label: str) -> int:
+    total = 0
+    started = time.perf_counter()
+    for batch in _batches(rows, batch_size):
+        conn.execute(insert(table), batch)
+        total += len(batch)
+        logger.info("%s: %d rows (%.0f rows/s)", label, total, total / (time.perf_counter() - started))
+    return total
+
+
+def seed(
+    books: int = 100_000,
+    users: int = 1_000,
+    wishlist_per_user: int = 10,
+    orders_per_user: int = 5,
+    random_seed: int = 42,
+    batch_size: int = 5_000,
+) -> Dict[str, Any]:
+    """
+    Create the tables and replace any previous benchmark data. Returns the
+    manifest describing the data for the scenarios.
+    """
+    rng = random.Random(random_seed)
+    Base.metadata.create_all(bind=engine)
+    hashed_password = get_password_hash(BENCH_PASSWORD)
+    now = datetime.utcnow()
+    
+    with engine.begin() as conn:
+        bench_users = select(User.id).where(User.email.like("bench-user-%"))
+        bench_orders = select(Order.id).where(Order.user_id.in_(bench_users))
+        conn.execute(delete(IdempotencyKey).where(IdempotencyKey.user_id.in_(bench_users)))
+        conn.execute(delete(OrderItem).where(OrderItem.order_id.in_(bench_orders)))
+        conn.execute(delete(Order).where(Order.id.in_(bench_orders)))
+        conn.execute(delete(WishlistItem).where(WishlistItem.user_id.in_(bench_users)))
+        conn.execute(delete(OrderItem).where(OrderItem.book_id.like("bench-%")))
+        conn.execute(delete(WishlistItem).where(WishlistItem.book_id.like("bench-%")))
+        conn.execute(delete(User).where(User.email.like("bench-user-%")))
+        conn.execute(delete(Book).where(Book.id.like("bench-%")))
+    
+    with engine.begin() as conn:
+        _insert(conn, Book.__table__, generate_books(books, rng), batch_size, "books")
+        hot_book = next(generate_books(1, random.Random(random_seed)))
+        hot_book.update(id=HOT_BOOK_ID, title="Hot Release", isbn="979-hot", stock=HOT_BOOK_STOCK, featured=True)
+        conn.execute(insert(Book.__table__), [hot_book])
+        
+        user_rows = (
+            {
+                "id": f"bench-user-{index:06d}",
+                "email": user_email(index),
+                "hashed_password": hashed_password,
+                "full_name": f"Bench User {index}",
+                "is_active": True,
+                "is_admin": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for index in range(users)
+        )
+        _insert(conn, User.__table__, user_rows, batch_size, "users")
+        
+        def wishlist_rows() -> Iterator[Dict[str, Any]]:
+            for index in range(users):
+                for number, book in enumerate(rng.sample(range(books), min(wishlist_per_user, books))):
+                    yield {
+                        "id": f"bench-wish-{index:06d}-{number:03d}",
+                        "user_id": f"bench-user-{index:06d}",
+                        "book_id": book_id(book),
+                        "added_at": now - timedelta(minutes=number),
+                    }
+        _insert(conn, WishlistItem.__table__, wishlist_rows(), batch_size, "wishlist items")
+        
+        orders: List[Dict[str, Any]] = []
+        items: List[Dict[str, Any]] = []
+        for index in range(users):
+            for number in range(orders_per_user):
+                order_id = f"bench-order-{index:06d}-{number:03d}"
+                created_at = now - timedelta(days=rng.uniform(0, 365))
+                lines = [(book_id(rng.randrange(books)), rng.randint(1, 3)) for _ in range(rng.randint(1, 3))]
+                prices = [round(rng.uniform(4.99, 39.99), 2) for _ in lines]
+                for line, ((line_book_id, quantity), price) in enumerate(zip(lines, prices)):
+                    items.append({
+                        "id": f"{order_id}-{line}",
+                        "order_id": order_id,
+                        "book_id": line_book_id,
+                        "quantity": quantity,
+                        "unit_price": price,
+                        "created_at": created_at,
+                    })
+                orders.append({
+                    "id": order_id,
+                    "user_id": f"bench-user-{index:06d}",
+                    "status": rng.choice(["pending", "processing", "shipped", "delivered"]),
+                    "total_amount": round(sum(price * quantity for (_, quantity), price in zip(lines, prices)), 2),
+                    "shipping_address": f"{index} Benchmark Street",
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                    "item_count": sum(quantity for _, quantity in lines),
+                })
+            if len(orders) >= batch_size:
+                conn.execute(insert(Order.__table__), orders)
+                conn.execute(insert(OrderItem.__table__), items)
+                orders, items = [], []
+        if orders:
+            conn.execute(insert(Order.__table__), orders)
+            conn.execute(insert(OrderItem.__table__), items)
+    
+    with engine.connect() as conn:
+        total_books = conn.execute(select(func.count()).select_from(Book)).scalar()
+    logger.info("Seeded %d benchmark books (%d books in total) and %d users", books, total_books, users)
+    return {
+        "books": books,
+        "users": users,
+        "password": BENCH_PASSWORD,
+        "hot_book_id": HOT_BOOK_ID,
+        "categories": CATEGORIES,
+        "search_terms": SEARCH_TERMS,
+        "random_seed": random_seed,
+    }
@@ -1,15 +1,29 @@
+import argparse
+import logging
 import sys
 import os
+from typing import List, Optional
 
 # Add the current directory to the Python path
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 from app.db.session import engine
 from app.db.base import Base
+from app.db.bulk import load_books_file
 from app.db.init_db import init_db
 from app.db.session import SessionLocal
 
-def main():
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Create the database tables and load seed data.")
+    parser.add_argument("--books-file", help="JSONL or CSV file of books to bulk load after the seed data")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="format of --books-file (default: from the extension)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="books inserted per statement (default: 1000)")
+    parser.add_argument("--copy", action="store_true", help="load --books-file through COPY (PostgreSQL with psycopg2)")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv or [])
+    
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)
     print("Tables created successfully!")
@@ -22,6 +36,12 @@ def main():
         print("Database initialized successfully!")
     finally:
         db.close()
+    
+    if args.books_file:
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        print(f"Loading books from {args.books_file}...")
+        stats = load_books_file(engine, args.books_file, args.format, args.chunk_size, args.copy)
+        print(f"Books loaded: {stats}")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main(sys.argv[1:])
@@ -1,7 +1,15 @@
-from fastapi import FastAPI
+import asyncio
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from app.api.middleware import MetricsMiddleware, QueryBudgetMiddleware, ReadYourWritesMiddleware
 from app.api.v1.api import api_router
+from app.core import jobs, query_budget
+from app.core.cache import catalog_cache, delayed_invalidations, principal_cache
 from app.core.config import settings
+from app.core.metrics import CONTENT_TYPE_LATEST, instrument_engines, render_metrics
+from app.core.security import shutdown_password_pool
+from app.db.session import async_engine, replica_router
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -21,10 +29,70 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+# Keep users who just wrote on the primary database
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Per-route SQL statement budgets (development and tests)
+if settings.QUERY_BUDGET_MODE != "off":
+    query_budget.instrument_engines()
+    app.add_middleware(QueryBudgetMiddleware)
+
+# Request metrics; added last so it also times the other middleware
+if settings.METRICS_ENABLED:
+    instrument_engines()
+    app.add_middleware(MetricsMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+# Background maintenance tasks, cancelled on shutdown
+background_tasks = []
+
+
+@app.on_event("startup")
+async def start_background_tasks():
+    await catalog_cache.start()
+    await principal_cache.start()
+    background_tasks.append(asyncio.create_task(jobs.run_periodically(
+        settings.IDEMPOTENCY_CLEANUP_INTERVAL_MINUTES * 60, jobs.purge_idempotency_keys
+    )))
+    # Imports interrupted by a crash or restart would otherwise stay "running"
+    background_tasks.append(asyncio.create_task(jobs.run_periodically(
+        settings.CATALOG_IMPORT_STALE_SECONDS, jobs.expire_stale_imports, run_first=True
+    )))
+    # Autocomplete falls back to the database until the first build is done
+    background_tasks.append(asyncio.create_task(jobs.run_periodically(
+        settings.SUGGEST_REFRESH_INTERVAL_SECONDS, jobs.refresh_suggest_index, run_first=True
+    )))
+    if replica_router.engines:
+        await jobs.check_replicas()
+        background_tasks.append(asyncio.create_task(jobs.run_periodically(
+            settings.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS, jobs.check_replicas
+        )))
+
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    # Let interrupted imports record their status before the engines and caches go away
+    for task in jobs.import_tasks:
+        task.cancel()
+    await asyncio.gather(*jobs.import_tasks, return_exceptions=True)
+    for task in delayed_invalidations:
+        task.cancel()
+    await catalog_cache.stop()
+    await principal_cache.stop()
+    shutdown_password_pool()
+    for task in background_tasks:
+        task.cancel()
+    await async_engine.dispose()
+    await replica_router.dispose()
+
 
 @app.get("/")
 async def root():
-    return {"message": "Welcome to Orphaleia Bookshop API"} 
\ No newline at end of file
+    return {"message": "Welcome to Orphaleia Bookshop API"} 
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,37 @@
+import os
+import tempfile
+
+import pytest
+
+# Settings are read when the app is imported: point it at a throwaway SQLite
+# database and keep password hashing cheap
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["QUERY_BUDGET_MODE"] = "raise"
+
+API = "/api/v1"
+
+
+@pytest.fixture(scope="session")
+def database():
+    """A fresh database with the sample catalog and admin user"""
+    import create_tables
+    
+    create_tables.main()
+
+
+@pytest.fixture(scope="session")
+def client(database):
+    import main
+    from fastapi.testclient import TestClient
+    
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    response = client.post(
+        f"{API}/auth/login", data={"username": "admin@orphaleia.com", "password": "adminpassword"}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
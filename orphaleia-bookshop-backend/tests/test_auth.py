@@ -0,0 +1,36 @@
+import pytest
+
+from app.core.config import settings
+from tests.conftest import API
+from tests.test_orders import checkout, create_book
+
+
+@pytest.fixture
+def embed_claims(monkeypatch):
+    monkeypatch.setattr(settings, "JWT_EMBED_CLAIMS", True)
+
+
+def login(client, email, password):
+    response = client.post(f"{API}/auth/login", data={"username": email, "password": password})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_demoted_admin_loses_access_to_other_users_orders(client, admin_headers, embed_claims):
+    create_book(client, admin_headers, "auth-book", stock=5)
+    order_id = checkout(client, admin_headers, "auth-book").json()["id"]
+    
+    user = client.post(f"{API}/auth/register", json={"email": "staff@example.com", "password": "staffpassword"}).json()
+    response = client.put(f"{API}/users/{user['id']}", json={"is_admin": True}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    # The token embeds is_admin=true and stays valid after the demotion
+    staff_headers = login(client, "staff@example.com", "staffpassword")
+    assert order_id in [order["id"] for order in client.get(f"{API}/orders/", headers=staff_headers).json()]
+    assert client.get(f"{API}/orders/{order_id}", headers=staff_headers).status_code == 200
+    
+    response = client.put(f"{API}/users/{user['id']}", json={"is_admin": False}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    
+    assert client.get(f"{API}/orders/", headers=staff_headers).json() == []
+    assert client.get(f"{API}/orders/{order_id}", headers=staff_headers).status_code == 403
+    assert client.put(f"{API}/books/auth-book", json={"stock": 1}, headers=staff_headers).status_code == 403
@@ -0,0 +1,47 @@
+import json
+
+from sqlalchemy import create_engine, select
+
+from app.db.base_class import Base
+from app.db.bulk import load_books
+from app.models.book import Book
+
+
+def book_row(book_id, isbn):
+    return json.dumps({
+        "id": book_id,
+        "title": f"Book {book_id}",
+        "author": "A. Writer",
+        "price": 10.0,
+        "category": "Fiction",
+        "description": "A book",
+        "cover": "cover.jpg",
+        "isbn": isbn,
+        "publicationDate": "2020",
+        "format": "Paperback",
+        "pages": 100,
+        "language": "English",
+        "publisher": "Press",
+    })
+
+
+def test_rows_with_a_taken_id_are_reported_without_aborting_the_load(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bulk.db'}")
+    Base.metadata.create_all(engine, tables=[Book.__table__])
+    rows = [
+        book_row("b1", "isbn-1"),
+        book_row("b1", "isbn-2"),  # Same id as the previous row, different isbn
+        book_row("b3", "isbn-3"),
+        "not json",
+        book_row("b5", "isbn-5"),
+    ]
+    
+    stats = load_books(engine, iter(rows), chunk_size=3)
+    
+    assert (stats.read, stats.inserted, stats.invalid, stats.failed, stats.skipped) == (5, 3, 1, 1, 0)
+    with engine.connect() as conn:
+        assert sorted(conn.execute(select(Book.id)).scalars()) == ["b1", "b3", "b5"]
+    
+    # Loading the same rows again skips the books already present
+    stats = load_books(engine, iter(rows), chunk_size=3)
+    assert (stats.inserted, stats.invalid, stats.failed, stats.skipped) == (0, 1, 1, 3)
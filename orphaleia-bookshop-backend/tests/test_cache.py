@@ -0,0 +1,73 @@
+import asyncio
+
+import fakeredis
+import pytest
+
+from app.core.cache import RedisCacheBackend
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def make_cache(server: fakeredis.FakeServer) -> RedisCacheBackend:
+    """A worker's cache on the shared fake server"""
+    client = fakeredis.FakeAsyncRedis(server=server)
+    return RedisCacheBackend("test", max_entries=100, ttl_seconds=60, client=client, channel="test:invalidate")
+
+
+async def test_entries_are_shared_between_workers(server):
+    first, second = make_cache(server), make_cache(server)
+    await first.set("books?page=1", [{"id": "1"}], ["book:1"])
+    
+    assert await second.get("books?page=1") == [{"id": "1"}]
+    assert await second.get_many(["books?page=1", "books?page=2"]) == {"books?page=1": [{"id": "1"}]}
+    assert second.stats()["remote_hits"] == 1
+    assert second.stats()["remote_misses"] == 1
+
+
+async def test_invalidation_reaches_other_workers(server):
+    first, second = make_cache(server), make_cache(server)
+    await first.start()
+    await second.start()
+    try:
+        await first.set("books?page=1", [{"id": "1"}], ["book:1"])
+        # Keep a local copy in the second worker
+        assert await second.get("books?page=1") == [{"id": "1"}]
+        
+        await first.invalidate_tags(["book:1"])
+        for _ in range(100):
+            if second.local.stats()["entries"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        
+        assert second.local.stats()["entries"] == 0
+        assert await second.get("books?page=1") is None
+    finally:
+        await first.stop()
+        await second.stop()
+
+
+async def test_value_loaded_during_invalidation_is_not_cached(server):
+    cache = make_cache(server)
+    
+    async def load():
+        await cache.invalidate_tags(["book:1"])
+        return {"id": "1"}, ["book:1"]
+    
+    assert await cache.get_or_load("book?id=1", load) == {"id": "1"}
+    assert await cache.get("book?id=1") is None
+
+
+async def test_redis_errors_are_cache_misses(server):
+    cache = make_cache(server)
+    server.connected = False
+    
+    await cache.set("book?id=1", {"id": "1"}, ["book:1"])
+    await cache.invalidate_tags(["book:2"])
+    
+    # The local copy still serves this worker
+    assert await cache.get("book?id=1") == {"id": "1"}
+    assert await cache.get("book?id=2") is None
+    assert cache.stats()["errors"] == 3
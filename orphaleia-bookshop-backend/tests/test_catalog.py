@@ -0,0 +1,28 @@
+from app.core.config import settings
+from tests.conftest import API
+
+CSV = b"isbn,title,author,price,stock\n9780000000001,Dune,Frank Herbert,9.99,3\n"
+
+
+def import_catalog(client, headers, body, **extra_headers):
+    return client.post(
+        f"{API}/catalog/import",
+        content=body,
+        headers={**headers, "Content-Type": "text/csv", **extra_headers},
+    )
+
+
+def test_import_rejects_malformed_content_length(client, admin_headers):
+    response = import_catalog(client, admin_headers, CSV, **{"Content-Length": "lots"})
+    
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid Content-Length header"
+
+
+def test_import_limits_streamed_bytes(client, admin_headers, monkeypatch):
+    monkeypatch.setattr(settings, "CATALOG_IMPORT_MAX_BYTES", 16)
+    
+    # Chunked: no Content-Length to reject the upload up front
+    response = import_catalog(client, admin_headers, iter([CSV[:10], CSV[10:]]))
+    
+    assert response.status_code == 413
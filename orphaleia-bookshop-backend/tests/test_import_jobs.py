@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.core import jobs
+from app.db.crud import import_job as crud_import_job
+from app.db.session import AsyncSessionLocal
+from app.models.import_job import ImportJob
+
+
+async def create_job(status, heartbeat_at):
+    async with AsyncSessionLocal() as db:
+        job = await crud_import_job.create_import_job(db, None, "csv")
+        await crud_import_job.update_import_job(db, job.id, status=status, heartbeat_at=heartbeat_at)
+        return job.id
+
+
+async def job_status(job_id):
+    async with AsyncSessionLocal() as db:
+        return (await db.execute(select(ImportJob.status).where(ImportJob.id == job_id))).scalar_one()
+
+
+async def test_jobs_abandoned_by_their_worker_are_failed(database):
+    long_ago = datetime.utcnow() - timedelta(hours=1)
+    abandoned = await create_job("running", long_ago)
+    never_started = await create_job("pending", None)
+    active = await create_job("running", datetime.utcnow())
+    finished = await create_job("completed", long_ago)
+    # A pending job only counts as abandoned once it is old enough
+    async with AsyncSessionLocal() as db:
+        await crud_import_job.update_import_job(db, never_started, created_at=long_ago)
+    
+    await jobs.expire_stale_imports()
+    
+    assert await job_status(abandoned) == "failed"
+    assert await job_status(never_started) == "failed"
+    assert await job_status(active) == "running"
+    assert await job_status(finished) == "completed"
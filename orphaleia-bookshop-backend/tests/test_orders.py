@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from tests.conftest import API
+
+BOOK = {
+    "title": "Limited Edition",
+    "author": "A. Writer",
+    "price": 25.0,
+    "category": "Fiction",
+    "description": "Only a few copies",
+    "cover": "limited.jpg",
+    "isbn": "979-0-00-000001-1",
+    "publication_date": "2024",
+    "format": "Hardcover",
+    "pages": 200,
+    "language": "English",
+    "publisher": "Small Press",
+}
+
+
+def create_book(client, admin_headers, book_id, stock):
+    response = client.post(
+        f"{API}/books/", json={**BOOK, "id": book_id, "isbn": f"979-{book_id}", "stock": stock}, headers=admin_headers
+    )
+    assert response.status_code == 200, response.text
+
+
+def checkout(client, headers, book_id, quantity=1):
+    return client.post(
+        f"{API}/orders/",
+        json={"shipping_address": "1 Main St", "items": [{"book_id": book_id, "quantity": quantity, "unit_price": 0}]},
+        headers=headers,
+    )
+
+
+def test_checkout_reserves_stock(client, admin_headers):
+    create_book(client, admin_headers, "order-stock", stock=3)
+    
+    response = checkout(client, admin_headers, "order-stock", quantity=2)
+    assert response.status_code == 200, response.text
+    assert response.json()["item_count"] == 2
+    assert client.get(f"{API}/books/order-stock").json()["stock"] == 1
+    
+    response = checkout(client, admin_headers, "order-stock", quantity=2)
+    assert response.status_code == 400
+    assert client.get(f"{API}/books/order-stock").json()["stock"] == 1
+
+
+def test_concurrent_checkouts_do_not_oversell(client, admin_headers):
+    stock, buyers = 5, 20
+    create_book(client, admin_headers, "order-race", stock=stock)
+    
+    with ThreadPoolExecutor(max_workers=buyers) as pool:
+        responses = list(pool.map(lambda _: checkout(client, admin_headers, "order-race"), range(buyers)))
+    
+    statuses = [response.status_code for response in responses]
+    assert statuses.count(200) == stock
+    # Buyers that lost the race are refused: sold out (400), or stock taken
+    # between their check and their reservation (409)
+    assert all(status in (400, 409) for status in statuses if status != 200), statuses
+    assert client.get(f"{API}/books/order-race").json()["stock"] == 0
+    
+    orders = client.get(f"{API}/orders/", headers=admin_headers).json()
+    placed = [order for order in orders if order["items"][0]["book_id"] == "order-race"]
+    assert len(placed) == stock
@@ -0,0 +1,58 @@
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from app import models
+from app.api.pagination import decode_cursor, encode_cursor
+from tests.conftest import API
+
+BOOK_KEYSET = (models.Book.title, models.Book.id)
+ORDER_KEYSET = (models.Order.created_at, models.Order.id)
+
+
+def raw_cursor(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("title-asc", ["Circe", "2"])
+    
+    assert decode_cursor(cursor, "title-asc", BOOK_KEYSET) == ["Circe", "2"]
+
+
+@pytest.mark.parametrize("cursor, sort_key, columns", [
+    ("not-a-cursor!", "title-asc", BOOK_KEYSET),
+    (raw_cursor({"s": "price-asc", "v": [1.5, "2"]}), "title-asc", BOOK_KEYSET),
+    (raw_cursor({"s": "title-asc", "v": ["Circe"]}), "title-asc", BOOK_KEYSET),
+    (raw_cursor({"s": "title-asc", "v": [{"a": 1}, "x"]}), "title-asc", BOOK_KEYSET),
+    (raw_cursor({"s": "title-asc", "v": [["Circe"], None]}), "title-asc", BOOK_KEYSET),
+    (raw_cursor({"s": "title-asc", "v": [True, "x"]}), "title-asc", BOOK_KEYSET),
+    (raw_cursor({"s": "created-desc", "v": [12345, "x"]}), "created-desc", ORDER_KEYSET),
+    (raw_cursor({"s": "created-desc", "v": ["yesterday", "x"]}), "created-desc", ORDER_KEYSET),
+])
+def test_invalid_cursor_is_rejected(cursor, sort_key, columns):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, sort_key, columns)
+    
+    assert error.value.status_code == 400
+
+
+def test_tampered_cursor_is_a_bad_request(client, admin_headers):
+    response = client.get(f"{API}/books/", params={"cursor": raw_cursor({"s": "title-asc", "v": [{"a": 1}, "x"]})})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
+    
+    cursor = raw_cursor({"s": "created-desc", "v": [{"a": 1}, "x"]})
+    response = client.get(f"{API}/orders/", params={"cursor": cursor}, headers=admin_headers)
+    assert response.status_code == 400
+
+
+def test_next_page_follows_cursor(client):
+    first = client.get(f"{API}/books/", params={"limit": 2})
+    second = client.get(f"{API}/books/", params={"limit": 2, "cursor": first.headers["x-next-cursor"]})
+    
+    titles = [book["title"] for book in first.json() + second.json()]
+    assert titles == sorted(titles)
+    assert len(set(titles)) == 4
@@ -0,0 +1,39 @@
+import logging
+import re
+
+import pytest
+
+from app.api.v1.endpoints.orders import read_orders
+from app.core.config import settings
+from app.core.query_budget import QueryBudgetExceeded, fingerprint
+from tests.conftest import API
+
+
+def test_fingerprint_ignores_parameters():
+    assert fingerprint("SELECT * FROM book WHERE id IN (?, ?, ?) AND stock > 5") == fingerprint(
+        "SELECT * FROM book WHERE id IN (?)  AND stock > 12"
+    )
+
+
+def test_route_over_budget_raises(client, admin_headers, monkeypatch):
+    monkeypatch.setattr(read_orders, "query_budget", 0)
+    
+    with pytest.raises(QueryBudgetExceeded, match=r"/api/v1/orders/ executed \d+ SQL statements, budget is 0"):
+        client.get(f"{API}/orders/", headers=admin_headers)
+
+
+def test_route_over_budget_logs_statements_in_log_mode(client, admin_headers, monkeypatch, caplog):
+    monkeypatch.setattr(read_orders, "query_budget", 0)
+    monkeypatch.setattr(settings, "QUERY_BUDGET_MODE", "log")
+    
+    with caplog.at_level(logging.WARNING, logger="app.core.query_budget"):
+        response = client.get(f"{API}/orders/", headers=admin_headers)
+    
+    assert response.status_code == 200
+    [record] = caplog.records
+    message = record.getMessage()
+    assert "budget is 0" in message
+    # Fingerprints have their parameters replaced and carry the code that ran them
+    assert 'FROM "order"' in message
+    assert "LIMIT ? OFFSET ?" in message
+    assert re.search(r"from app/\S+\.py:\d+ in \w+ \(x1\)", message)
@@ -0,0 +1,92 @@
+import shutil
+import sqlite3
+import time
+
+import pytest
+from sqlalchemy.engine import make_url
+
+from app.core.cache import replica_pins
+from app.core.config import settings
+from app.db.session import ReplicaRouter, replica_router
+from tests.conftest import API
+from tests.test_orders import checkout, create_book
+
+
+@pytest.fixture
+def start_replica(client, tmp_path, monkeypatch):
+    """
+    Route reads to a replica: a copy of the primary database taken now, which
+    misses every later write like a lagging replica would.
+    """
+    routers = []
+    
+    def start(path=None):
+        if path is None:
+            path = str(tmp_path / "replica.db")
+            shutil.copy(make_url(settings.SQLALCHEMY_DATABASE_URI).database, path)
+        router = ReplicaRouter([f"sqlite:///{path}"])
+        for name in ("engines", "sessionmakers", "healthy"):
+            monkeypatch.setattr(replica_router, name, getattr(router, name))
+        routers.append(router)
+        return path
+    
+    yield start
+    for router in routers:
+        client.portal.call(router.dispose)
+    client.portal.call(replica_pins.clear)
+
+
+def update_replica(path, sql, *params):
+    with sqlite3.connect(path) as conn:
+        conn.execute(sql, params)
+
+
+def test_reads_are_served_from_the_replica(client, admin_headers, start_replica):
+    order_id = checkout(client, admin_headers, "1").json()["id"]
+    path = start_replica()
+    update_replica(path, 'UPDATE "order" SET shipping_address = ? WHERE id = ?', "replica", order_id)
+    
+    response = client.get(f"{API}/orders/{order_id}", headers=admin_headers)
+    
+    assert response.json()["shipping_address"] == "replica"
+
+
+def test_user_who_just_wrote_reads_from_the_primary(client, admin_headers, start_replica):
+    order_id = checkout(client, admin_headers, "1").json()["id"]
+    path = start_replica()
+    update_replica(path, 'UPDATE "order" SET shipping_address = ? WHERE id = ?', "replica", order_id)
+    
+    response = client.put(f"{API}/orders/{order_id}", json={"shipping_address": "2 High St"}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    
+    response = client.get(f"{API}/orders/{order_id}", headers=admin_headers)
+    assert response.json()["shipping_address"] == "2 High St"
+
+
+def test_unhealthy_replica_is_skipped(client, admin_headers, start_replica, tmp_path):
+    order_id = checkout(client, admin_headers, "1").json()["id"]
+    start_replica(str(tmp_path / "missing" / "replica.db"))
+    
+    client.portal.call(replica_router.check_health)
+    
+    assert replica_router.healthy == [False]
+    response = client.get(f"{API}/orders/{order_id}", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json()["id"] == order_id
+
+
+def test_stock_cached_from_a_lagging_replica_is_dropped_after_checkout(
+    client, admin_headers, start_replica, monkeypatch
+):
+    monkeypatch.setattr(settings, "REPLICA_PIN_SECONDS", 0.2)
+    create_book(client, admin_headers, "replica-stock", stock=5)
+    path = start_replica()
+    
+    assert checkout(client, admin_headers, "replica-stock").status_code == 200
+    # Anonymous readers still see the replica's stock, which gets cached
+    assert client.get(f"{API}/books/replica-stock").json()["stock"] == 5
+    
+    # Once the replica caught up, the cached stock goes away
+    update_replica(path, "UPDATE book SET stock = 4 WHERE id = 'replica-stock'")
+    time.sleep(0.5)
+    assert client.get(f"{API}/books/replica-stock").json()["stock"] == 4
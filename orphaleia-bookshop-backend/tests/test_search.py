@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.db.search import apply_search, build_tsquery
+from app.models.book import Book
+from tests.conftest import API
+
+
+def test_build_tsquery_prefix_matches_last_word():
+    assert build_tsquery("Song of Achil") == "song & of & achil:*"
+
+
+@pytest.mark.parametrize("search", ["!!", "_", " - "])
+def test_build_tsquery_without_words(search):
+    assert build_tsquery(search) is None
+
+
+def test_punctuation_only_search_still_filters_on_postgres():
+    query, _ = apply_search(select(Book.id), "!!", "postgresql")
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    
+    assert "WHERE" in sql
+    assert "LIKE" in sql
+
+
+@pytest.mark.parametrize("search", ["!!", "%", "_"])
+def test_punctuation_only_search_matches_no_book(client, search):
+    response = client.get(f"{API}/books/", params={"search": search})
+    
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_search_finds_title_prefix(client):
+    response = client.get(f"{API}/books/", params={"search": "achil", "sort": "relevance"})
+    
+    assert response.status_code == 200
+    assert [book["title"] for book in response.json()] == ["Song of Achilles"]
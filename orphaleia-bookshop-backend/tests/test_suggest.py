@@ -0,0 +1,65 @@
+from app.core.suggest import SuggestIndex, suggest_index
+from tests.conftest import API
+
+BOOKS = [
+    ("1", "Song of Achilles", "Madeline Miller"),
+    ("2", "Circe", "Madeline Miller"),
+    ("3", "The Hobbit", "J. R. R. Tolkien"),
+    ("4", "Sons and Lovers", "D. H. Lawrence"),
+]
+
+
+def build_index(books=BOOKS):
+    index = SuggestIndex()
+    index.begin_rebuild()
+    index.finish_rebuild(SuggestIndex.build(books))
+    return index
+
+
+def texts(suggestions):
+    return [suggestion["text"] for suggestion in suggestions]
+
+
+def test_prefix_matches_rank_above_typo_matches():
+    index = build_index()
+    
+    # "Sons and Lovers" starts with the query; "Song of Achilles" only looks like it
+    assert texts(index.suggest("sons")) == ["Sons and Lovers", "Song of Achilles"]
+
+
+def test_any_word_prefix_matches():
+    index = build_index()
+    
+    assert texts(index.suggest("mill")) == ["Madeline Miller"]
+    assert index.suggest("hobb") == [{"text": "The Hobbit", "kind": "title", "book_id": "3"}]
+
+
+def test_one_character_typo_still_matches():
+    index = build_index()
+    
+    assert "Song of Achilles" in texts(index.suggest("achiles"))
+    assert "Circe" in texts(index.suggest("cirse"))
+
+
+def test_changes_during_rebuild_are_replayed():
+    index = build_index()
+    index.begin_rebuild()
+    # The rebuild loaded its rows before these changes
+    state = SuggestIndex.build(BOOKS)
+    index.add_book("5", "Piranesi", "Susanna Clarke")
+    index.remove_book("2")
+    index.finish_rebuild(state)
+    
+    assert texts(index.suggest("piran")) == ["Piranesi"]
+    assert index.suggest("circe") == []
+
+
+def test_database_fallback_before_first_build(client, monkeypatch):
+    # Not built yet: nothing indexed, so suggestions must come from the database
+    monkeypatch.setattr(suggest_index, "_state", SuggestIndex.build([]))
+    monkeypatch.setattr(suggest_index, "ready", False)
+    
+    response = client.get(f"{API}/books/suggest", params={"q": "song"})
+    
+    assert response.status_code == 200
+    assert {"text": "Song of Achilles", "kind": "title", "book_id": "1"} in response.json()